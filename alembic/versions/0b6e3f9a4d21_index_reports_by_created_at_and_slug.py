@@ -0,0 +1,26 @@
+"""Index reports by created_at and slug
+
+Revision ID: 0b6e3f9a4d21
+Revises: f4a19d6b2c85
+Create Date: 2026-10-15 14:31:09.442871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6e3f9a4d21'
+down_revision: Union[str, None] = 'f4a19d6b2c85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_reports_created_slug', 'reports', ['created_at', 'slug'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reports_created_slug', table_name='reports')
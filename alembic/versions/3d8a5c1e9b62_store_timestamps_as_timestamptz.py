@@ -0,0 +1,48 @@
+"""Store timestamps as timestamptz
+
+Revision ID: 3d8a5c1e9b62
+Revises: 0b6e3f9a4d21
+Create Date: 2026-10-15 15:02:47.118306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d8a5c1e9b62'
+down_revision: Union[str, None] = '0b6e3f9a4d21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Existing naive values were written with datetime.utcnow(), so they are UTC
+TIMESTAMP_COLUMNS = {
+    'jobs': ['created_at', 'updated_at', 'started_at', 'completed_at'],
+    'charts': ['created_at'],
+    'reports': ['created_at', 'pushed_at', 'expires_at', 'last_accessed_at'],
+    'avatar_clusters': ['created_at', 'updated_at'],
+}
+
+
+def upgrade() -> None:
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table, column,
+                type_=sa.DateTime(timezone=True),
+                existing_type=sa.DateTime(),
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'"
+            )
+
+
+def downgrade() -> None:
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table, column,
+                type_=sa.DateTime(),
+                existing_type=sa.DateTime(timezone=True),
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'"
+            )
@@ -0,0 +1,32 @@
+"""Store chart PNGs as raw bytes
+
+Revision ID: a3c91e7f2b40
+Revises: 54ce56a568de
+Create Date: 2026-10-15 10:12:44.381920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c91e7f2b40'
+down_revision: Union[str, None] = '54ce56a568de'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('charts', sa.Column('png', sa.LargeBinary(), nullable=True))
+    op.execute("UPDATE charts SET png = decode(image_data, 'base64')")
+    op.alter_column('charts', 'png', nullable=False)
+    op.drop_column('charts', 'image_data')
+
+
+def downgrade() -> None:
+    op.add_column('charts', sa.Column('image_data', sa.Text(), nullable=True))
+    op.execute("UPDATE charts SET image_data = encode(png, 'base64')")
+    op.alter_column('charts', 'image_data', nullable=False)
+    op.drop_column('charts', 'png')
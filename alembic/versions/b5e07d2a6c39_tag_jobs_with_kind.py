@@ -0,0 +1,28 @@
+"""Tag jobs with their kind and index the latest run per kind
+
+Revision ID: b5e07d2a6c39
+Revises: 3d8a5c1e9b62
+Create Date: 2026-10-15 23:41:08.532917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e07d2a6c39'
+down_revision: Union[str, None] = '3d8a5c1e9b62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('kind', sa.String(length=30), nullable=True))
+    op.create_index('ix_jobs_kind_created', 'jobs', ['kind', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_kind_created', table_name='jobs')
+    op.drop_column('jobs', 'kind')
@@ -0,0 +1,26 @@
+"""Index charts by job and chart id
+
+Revision ID: c7d4e81f0a92
+Revises: a3c91e7f2b40
+Create Date: 2026-10-15 11:03:18.527604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d4e81f0a92'
+down_revision: Union[str, None] = 'a3c91e7f2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_chart_job_chart', 'charts', ['job_id', 'chart_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_chart_job_chart', table_name='charts')
@@ -0,0 +1,26 @@
+"""Index jobs by created_at and id
+
+Revision ID: e2b85c3d7f14
+Revises: c7d4e81f0a92
+Create Date: 2026-10-15 13:27:51.094316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b85c3d7f14'
+down_revision: Union[str, None] = 'c7d4e81f0a92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_jobs_created_id', 'jobs', ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_created_id', table_name='jobs')
@@ -0,0 +1,33 @@
+"""Track report push time and index the pending queue
+
+Revision ID: f4a19d6b2c85
+Revises: e2b85c3d7f14
+Create Date: 2026-10-15 14:02:36.718245
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a19d6b2c85'
+down_revision: Union[str, None] = 'e2b85c3d7f14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('reports', sa.Column('pushed_at', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_reports_unpushed',
+        'reports',
+        ['created_at'],
+        postgresql_where=sa.text('pushed_at IS NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reports_unpushed', table_name='reports')
+    op.drop_column('reports', 'pushed_at')
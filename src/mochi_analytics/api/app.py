@@ -5,12 +5,35 @@ Version: 2.0.0
 """
 
 import os
-from datetime import datetime
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from mochi_analytics.api.models import HealthResponse
+from mochi_analytics.api.orjson_response import ORJSONResponse
+from mochi_analytics.api.routes import (
+    analysis,
+    exports,
+    jobs,
+    organizations,
+    reports,
+    tasks,
+)
+from mochi_analytics.integrations import close_shared_clients
+from mochi_analytics.storage.database import create_tables
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize the database and build the OpenAPI schema on startup."""
+    create_tables()
+    app.openapi()
+    yield
+    # Release pooled integration connections (Mochi, Airtable, Slack, Framer)
+    close_shared_clients()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -18,27 +41,37 @@ app = FastAPI(
     description="Analytics platform for Mochi conversation data",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
+# Comma-separated allowlist; an explicit list is matched with a set lookup
+# instead of reflecting every request's Origin header back.
+CORS_ALLOW_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("CORS_ALLOW_ORIGINS", "*").split(",")
+    if origin.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure this in production
+    allow_origins=CORS_ALLOW_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
 
+# Static part of the health payload; only the timestamp changes per request
+_HEALTH_FIELDS = {"status": "healthy", "version": "2.0.0"}
+
+
 @app.get("/health", response_model=HealthResponse)
-async def health_check() -> HealthResponse:
+async def health_check() -> ORJSONResponse:
     """Health check endpoint."""
-    return HealthResponse(
-        status="healthy",
-        timestamp=datetime.utcnow(),
-        version="2.0.0"
-    )
+    return ORJSONResponse({**_HEALTH_FIELDS, "timestamp": datetime.now(timezone.utc)})
 
 
 @app.get("/")
@@ -51,38 +84,24 @@ async def root():
     }
 
 
-# Import and include routers after app is created to avoid circular imports
-def setup_routes():
-    """Setup API routes."""
-    from mochi_analytics.api.routes import (
-        analysis,
-        exports,
-        jobs,
-        organizations,
-        reports,
-        tasks,
-    )
-
-    app.include_router(analysis.router, prefix="/api/v1", tags=["Analysis"])
-    app.include_router(jobs.router, prefix="/api/v1", tags=["Jobs"])
-    app.include_router(exports.router, prefix="/api/v1", tags=["Exports"])
-    app.include_router(reports.router, prefix="/api/v1", tags=["Reports"])
-    app.include_router(organizations.router, prefix="/api/v1", tags=["Organizations"])
-    app.include_router(tasks.router, prefix="/api/v1", tags=["Tasks"])
-
-
-# Setup routes on startup
-@app.on_event("startup")
-async def startup_event():
-    """Run on application startup."""
-    setup_routes()
-
-    # Initialize database
-    from mochi_analytics.storage.database import create_tables
-    create_tables()
+# API routes
+app.include_router(analysis.router, prefix="/api/v1", tags=["Analysis"])
+app.include_router(jobs.router, prefix="/api/v1", tags=["Jobs"])
+app.include_router(exports.router, prefix="/api/v1", tags=["Exports"])
+app.include_router(reports.router, prefix="/api/v1", tags=["Reports"])
+app.include_router(organizations.router, prefix="/api/v1", tags=["Organizations"])
+app.include_router(tasks.router, prefix="/api/v1", tags=["Tasks"])
+
+
+def _check_unique_routes() -> None:
+    """Fail at import if two handlers share a path and method (the later one would be unreachable)."""
+    seen = set()
+    for route in app.routes:
+        for method in getattr(route, "methods", None) or ():
+            key = (method, route.path)
+            if key in seen:
+                raise RuntimeError(f"Duplicate route: {method} {route.path}")
+            seen.add(key)
 
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Run on application shutdown."""
-    pass
+_check_unique_routes()
@@ -63,11 +63,21 @@ class JobStatusResponse(BaseModel):
     error: str | None = Field(None, description="Error message (if failed)")
 
 
+class JobSummary(BaseModel):
+    """Job status without the analysis result, for list views."""
+
+    job_id: str = Field(..., description="Job identifier")
+    status: JobStatus = Field(..., description="Job status")
+    created_at: datetime = Field(..., description="Job creation timestamp")
+    completed_at: datetime | None = Field(None, description="Job completion timestamp")
+    error: str | None = Field(None, description="Error message (if failed)")
+
+
 class JobListResponse(BaseModel):
     """Response model for job list."""
 
-    jobs: list[JobStatusResponse] = Field(..., description="List of jobs")
-    total: int = Field(..., description="Total number of jobs")
+    jobs: list[JobSummary] = Field(..., description="List of jobs, newest first")
+    next_cursor: str | None = Field(None, description="Cursor for the next page (null on the last page)")
 
 
 class HealthResponse(BaseModel):
@@ -93,6 +103,7 @@ class TaskResponse(BaseModel):
     message: str | None = Field(None, description="Additional information")
     jobs_created: int = Field(default=0, description="Number of jobs created")
     errors: list[str] = Field(default_factory=list, description="List of errors encountered")
+    job_id: str | None = Field(None, description="Job ID when the task was queued")
 
 
 class OrganizationResponse(BaseModel):
@@ -0,0 +1,32 @@
+"""
+Keyset pagination cursors.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+
+import orjson
+from fastapi import HTTPException
+
+
+def encode_cursor(created_at: datetime, key: str) -> str:
+    """
+    Encode a keyset cursor from the (created_at, key) of the last row on a page.
+
+    The cursor is opaque and URL-safe (unpadded urlsafe base64), so clients
+    can put it in a query string as-is; a raw isoformat would carry a "+"
+    from the UTC offset, which decodes as a space.
+    """
+    payload = orjson.dumps([created_at.isoformat(), key])
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, key = orjson.loads(payload)
+        return datetime.fromisoformat(created_at), str(key)
+    except (ValueError, TypeError, binascii.Error, orjson.JSONDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
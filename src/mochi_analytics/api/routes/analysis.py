@@ -3,9 +3,11 @@ Analysis API routes.
 """
 
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session
 
 from mochi_analytics.api.models import (
     AnalysisRequest,
@@ -13,15 +15,31 @@ from mochi_analytics.api.models import (
     JobStatus,
     JobStatusResponse,
 )
-from mochi_analytics.storage.database import get_session
+from mochi_analytics.api.orjson_response import ORJSONResponse
+from mochi_analytics.api.routes.jobs import build_job_status_payload
+from mochi_analytics.storage.database import get_db
 from mochi_analytics.storage.models import Job
 from mochi_analytics.workers import submit_job, run_analysis_task
 
 router = APIRouter()
 
 
+async def get_json_body(request: Request) -> Any:
+    """
+    Raw JSON request body as plain Python objects.
+
+    FastAPI has already parsed the body while validating the request model,
+    and Starlette caches it on the request, so this does not decode it again.
+    """
+    return await request.json()
+
+
 @router.post("/analysis", response_model=JobResponse)
-async def create_analysis_job(request: AnalysisRequest) -> JobResponse:
+def create_analysis_job(
+    request: AnalysisRequest,
+    body: Any = Depends(get_json_body),
+    db: Session = Depends(get_db)
+) -> JobResponse:
     """
     Submit a new analysis job.
 
@@ -31,20 +49,18 @@ async def create_analysis_job(request: AnalysisRequest) -> JobResponse:
     job_id = str(uuid.uuid4())
 
     # Create job record with queued status
-    session = get_session()
-    try:
-        job = Job(
-            id=job_id,
-            status=JobStatus.QUEUED.value,
-            created_at=datetime.utcnow()
-        )
-        session.add(job)
-        session.commit()
-    finally:
-        session.close()
-
-    # Submit job to background worker queue
-    conversations_data = [c.model_dump() for c in request.conversations]
+    job = Job(
+        id=job_id,
+        status=JobStatus.QUEUED.value,
+        created_at=datetime.now(timezone.utc)
+    )
+    db.add(job)
+    db.commit()
+
+    # Submit job to background worker queue. The request model is only used
+    # for validation; the worker re-validates the raw conversation dicts, so
+    # they are passed through instead of dumping every validated model again.
+    conversations_data = body["conversations"]
     config_dict = request.config.model_dump()
     config_dict["job_id"] = job_id  # Pass job_id for chart storage
 
@@ -59,31 +75,13 @@ async def create_analysis_job(request: AnalysisRequest) -> JobResponse:
 
 
 @router.get("/analysis/{job_id}", response_model=JobStatusResponse)
-async def get_analysis_status(job_id: str) -> JobStatusResponse:
+def get_analysis_status(job_id: str, db: Session = Depends(get_db)) -> ORJSONResponse:
     """
     Get analysis job status and results.
     """
-    session = get_session()
-    try:
-        job = session.query(Job).filter(Job.id == job_id).first()
-
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
-
-        # Parse result if completed
-        result = None
-        if job.status == JobStatus.COMPLETED.value and job.result:
-            from mochi_analytics.core.models import AnalysisResult
-            result = AnalysisResult.model_validate(job.result)
-
-        return JobStatusResponse(
-            job_id=job.id,
-            status=JobStatus(job.status),
-            created_at=job.created_at,
-            completed_at=job.completed_at,
-            result=result,
-            error=job.error
-        )
-
-    finally:
-        session.close()
+    job = db.get(Job, job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return ORJSONResponse(build_job_status_payload(job))
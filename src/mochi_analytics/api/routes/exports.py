@@ -2,54 +2,77 @@
 Exports API routes.
 """
 
-import base64
 import io
 import zipfile
+from collections.abc import Iterator
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
 
 from mochi_analytics.api.models import JobStatus
 from mochi_analytics.core.models import AnalysisResult
-from mochi_analytics.exporters import export_framer_csv, export_json
-from mochi_analytics.storage.database import get_session
+from mochi_analytics.exporters import export_framer_csv, export_json_from_dict
+from mochi_analytics.storage.database import get_db, get_session
 from mochi_analytics.storage.models import Chart, Job
 
 router = APIRouter()
 
 
-def get_job_result(job_id: str) -> AnalysisResult:
-    """Helper to get job result."""
-    session = get_session()
-    try:
-        job = session.query(Job).filter(Job.id == job_id).first()
+class _ZipChunkBuffer(io.RawIOBase):
+    """Write-only, non-seekable sink that hands ZIP output back in chunks."""
 
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
+    def __init__(self):
+        super().__init__()
+        self._chunks: list[bytes] = []
 
-        if job.status != JobStatus.COMPLETED.value:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Job not completed. Current status: {job.status}"
-            )
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        """Return and clear everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def get_job_result_data(db: Session, job_id: str) -> dict[str, Any]:
+    """Helper to get the stored job result as a plain dict."""
+    job = db.get(Job, job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if job.status != JobStatus.COMPLETED.value:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Job not completed. Current status: {job.status}"
+        )
+
+    if not job.result:
+        raise HTTPException(status_code=500, detail="Job result is empty")
 
-        if not job.result:
-            raise HTTPException(status_code=500, detail="Job result is empty")
+    return job.result
 
-        return AnalysisResult.model_validate(job.result)
 
-    finally:
-        session.close()
+def get_job_result(db: Session, job_id: str) -> AnalysisResult:
+    """Helper to get job result."""
+    return AnalysisResult.model_validate(get_job_result_data(db, job_id))
 
 
 @router.get("/exports/{job_id}/json")
-async def export_job_json(job_id: str):
+def export_job_json(job_id: str, db: Session = Depends(get_db)):
     """
     Export job result as JSON file.
     """
-    result = get_job_result(job_id)
-    json_content = export_json(result)
+    result_data = get_job_result_data(db, job_id)
+    json_content = export_json_from_dict(result_data)
 
     return Response(
         content=json_content,
@@ -61,11 +84,11 @@ async def export_job_json(job_id: str):
 
 
 @router.get("/exports/{job_id}/csv")
-async def export_job_csv(job_id: str):
+def export_job_csv(job_id: str, db: Session = Depends(get_db)):
     """
     Export job result as CSV file (Framer CMS format).
     """
-    result = get_job_result(job_id)
+    result = get_job_result(db, job_id)
     csv_content = export_framer_csv(result)
 
     return Response(
@@ -78,71 +101,89 @@ async def export_job_csv(job_id: str):
 
 
 @router.get("/exports/{job_id}/charts/{chart_id}.png")
-async def export_chart_png(job_id: str, chart_id: str):
+def export_chart_png(job_id: str, chart_id: str, db: Session = Depends(get_db)):
     """
     Export a specific chart as PNG image.
     """
-    session = get_session()
-    try:
-        chart = session.query(Chart).filter(
+    png = db.scalar(
+        select(Chart.png).where(
             Chart.job_id == job_id,
             Chart.chart_id == chart_id
-        ).first()
-
-        if not chart:
-            raise HTTPException(status_code=404, detail="Chart not found")
-
-        # Decode base64 PNG
-        png_bytes = base64.b64decode(chart.png_base64)
-
-        return Response(
-            content=png_bytes,
-            media_type="image/png",
-            headers={
-                "Content-Disposition": f"inline; filename={chart_id}.png"
-            }
         )
+    )
 
-    finally:
-        session.close()
+    if png is None:
+        raise HTTPException(status_code=404, detail="Chart not found")
+
+    return Response(
+        content=png,
+        media_type="image/png",
+        headers={
+            "Content-Disposition": f"inline; filename={chart_id}.png"
+        }
+    )
 
 
 @router.get("/exports/{job_id}/zip")
-async def export_job_zip(job_id: str):
+def export_job_zip(job_id: str, db: Session = Depends(get_db)):
     """
     Export job result as ZIP bundle (JSON + CSV + all charts).
     """
-    result = get_job_result(job_id)
+    result_data = get_job_result_data(db, job_id)
+    result = AnalysisResult.model_validate(result_data)
 
-    # Create in-memory ZIP file
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+    return StreamingResponse(
+        iter_job_zip(job_id, result_data, result),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename=mochi_analytics_{job_id}.zip"
+        }
+    )
+
+
+def iter_job_zip(
+    job_id: str,
+    result_data: dict[str, Any],
+    result: AnalysisResult
+) -> Iterator[bytes]:
+    """
+    Build the ZIP bundle incrementally, yielding bytes after each entry.
+
+    The JSON entry is written straight from the stored result dict; the
+    validated model is only needed for the CSV exporter.
+
+    Charts are read from the database in small batches, so only one PNG is
+    held in memory at a time and the first bytes go out before the last
+    chart is loaded.
+    """
+    buffer = _ZipChunkBuffer()
+
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
         # Add JSON
-        json_content = export_json(result)
+        json_content = export_json_from_dict(result_data)
         zip_file.writestr(f"analysis_{job_id}.json", json_content)
+        yield buffer.drain()
 
         # Add CSV
         csv_content = export_framer_csv(result)
         zip_file.writestr(f"framer_import_{job_id}.csv", csv_content)
+        yield buffer.drain()
 
-        # Add all charts
+        # Add all charts (own session: the request session is closed before streaming)
         session = get_session()
         try:
-            charts = session.query(Chart).filter(Chart.job_id == job_id).all()
+            charts = session.execute(
+                select(Chart.chart_id, Chart.png)
+                .where(Chart.job_id == job_id)
+                .execution_options(yield_per=32)
+            )
 
-            for chart in charts:
-                png_bytes = base64.b64decode(chart.png_base64)
-                zip_file.writestr(f"charts/{chart.chart_id}.png", png_bytes)
+            for chart_id, png in charts:
+                zip_file.writestr(f"charts/{chart_id}.png", png)
+                yield buffer.drain()
 
         finally:
             session.close()
 
-    # Return ZIP
-    zip_buffer.seek(0)
-    return StreamingResponse(
-        io.BytesIO(zip_buffer.read()),
-        media_type="application/zip",
-        headers={
-            "Content-Disposition": f"attachment; filename=mochi_analytics_{job_id}.zip"
-        }
-    )
+    # Central directory is written when the archive is closed
+    yield buffer.drain()
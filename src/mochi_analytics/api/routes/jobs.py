@@ -2,120 +2,121 @@
 Jobs API routes.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
 
 from mochi_analytics.api.models import JobListResponse, JobResponse, JobStatus, JobStatusResponse
-from mochi_analytics.storage.database import get_session
+from mochi_analytics.api.orjson_response import ORJSONResponse
+from mochi_analytics.api.pagination import decode_cursor, encode_cursor
+from mochi_analytics.storage.database import get_db
 from mochi_analytics.storage.models import Job
 
 router = APIRouter()
 
 
-@router.get("/jobs", response_model=JobListResponse)
-async def list_jobs(
-    limit: int = Query(default=50, ge=1, le=500),
-    offset: int = Query(default=0, ge=0),
-    status: JobStatus | None = None
-) -> JobListResponse:
+def build_job_status_payload(job: Job) -> dict[str, Any]:
     """
-    List all jobs with optional filtering.
+    Build a JobStatusResponse-shaped dict from a job row.
+
+    The stored result is already JSON-compatible, so it is passed through
+    as-is instead of being validated into AnalysisResult and dumped again.
     """
-    session = get_session()
-    try:
-        query = session.query(Job).order_by(Job.created_at.desc())
+    result = None
+    if job.status == JobStatus.COMPLETED.value and job.result:
+        result = job.result
 
-        # Filter by status if provided
-        if status:
-            query = query.filter(Job.status == status.value)
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "created_at": job.created_at,
+        "completed_at": job.completed_at,
+        "result": result,
+        "error": job.error
+    }
+
+
+@router.get("/jobs", response_model=JobListResponse)
+def list_jobs(
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
+    status: JobStatus | None = None,
+    db: Session = Depends(get_db)
+) -> ORJSONResponse:
+    """
+    List jobs, newest first, with optional status filtering.
 
-        # Get total count
-        total = query.count()
+    Uses keyset pagination on (created_at, id), so deep pages cost the same
+    as the first one. Results are not included; fetch /jobs/{job_id} for those.
+    """
+    # Filter by status if provided
+    filters = [Job.status == status.value] if status else []
 
-        # Apply pagination
-        jobs_db = query.limit(limit).offset(offset).all()
+    if cursor:
+        filters.append(tuple_(Job.created_at, Job.id) < decode_cursor(cursor))
 
-        # Convert to response models
-        jobs = []
-        for job in jobs_db:
-            result = None
-            if job.status == JobStatus.COMPLETED.value and job.result:
-                from mochi_analytics.core.models import AnalysisResult
-                result = AnalysisResult.model_validate(job.result)
+    rows = db.execute(
+        select(Job.id, Job.status, Job.created_at, Job.completed_at, Job.error)
+        .where(*filters)
+        .order_by(Job.created_at.desc(), Job.id.desc())
+        .limit(limit)
+    ).all()
 
-            jobs.append(
-                JobStatusResponse(
-                    job_id=job.id,
-                    status=JobStatus(job.status),
-                    created_at=job.created_at,
-                    completed_at=job.completed_at,
-                    result=result,
-                    error=job.error
-                )
-            )
+    jobs = [
+        {
+            "job_id": row.id,
+            "status": row.status,
+            "created_at": row.created_at,
+            "completed_at": row.completed_at,
+            "error": row.error
+        }
+        for row in rows
+    ]
 
-        return JobListResponse(jobs=jobs, total=total)
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
 
-    finally:
-        session.close()
+    return ORJSONResponse({"jobs": jobs, "next_cursor": next_cursor})
 
 
 @router.get("/jobs/{job_id}", response_model=JobStatusResponse)
-async def get_job(job_id: str) -> JobStatusResponse:
+def get_job(job_id: str, db: Session = Depends(get_db)) -> ORJSONResponse:
     """
     Get job status and details.
     """
-    session = get_session()
-    try:
-        job = session.query(Job).filter(Job.id == job_id).first()
-
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
-
-        result = None
-        if job.status == JobStatus.COMPLETED.value and job.result:
-            from mochi_analytics.core.models import AnalysisResult
-            result = AnalysisResult.model_validate(job.result)
-
-        return JobStatusResponse(
-            job_id=job.id,
-            status=JobStatus(job.status),
-            created_at=job.created_at,
-            completed_at=job.completed_at,
-            result=result,
-            error=job.error
-        )
+    job = db.get(Job, job_id)
 
-    finally:
-        session.close()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return ORJSONResponse(build_job_status_payload(job))
 
 
 @router.post("/jobs/{job_id}/retry", response_model=JobResponse)
-async def retry_job(job_id: str) -> JobResponse:
+def retry_job(job_id: str, db: Session = Depends(get_db)) -> JobResponse:
     """
     Retry a failed job.
     """
-    session = get_session()
-    try:
-        job = session.query(Job).filter(Job.id == job_id).first()
-
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
+    job = db.get(Job, job_id)
 
-        if job.status != JobStatus.FAILED.value:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Can only retry failed jobs. Current status: {job.status}"
-            )
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
 
-        # Reset job status
-        job.status = JobStatus.QUEUED.value
-        job.error = None
-        job.completed_at = None
-        session.commit()
+    if job.status != JobStatus.FAILED.value:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Can only retry failed jobs. Current status: {job.status}"
+        )
 
-        # TODO: Queue job for processing by worker
+    # Reset job status
+    job.status = JobStatus.QUEUED.value
+    job.error = None
+    job.completed_at = None
+    db.commit()
 
-        return JobResponse(job_id=job.id, status=JobStatus.QUEUED)
+    # TODO: Queue job for processing by worker
 
-    finally:
-        session.close()
+    return JobResponse(job_id=job.id, status=JobStatus.QUEUED)
@@ -3,9 +3,10 @@ Organizations API routes.
 """
 
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
 
 from mochi_analytics.api.models import (
     JobResponse,
@@ -14,17 +15,17 @@ from mochi_analytics.api.models import (
     OrganizationListResponse,
     OrganizationResponse,
 )
-from mochi_analytics.core.analyzer import analyze_conversations
-from mochi_analytics.core.models import AnalysisConfig, Conversation
-from mochi_analytics.integrations import MochiAPIError, fetch_conversations, get_organization_by_id, get_organizations
-from mochi_analytics.storage.database import get_session
+from mochi_analytics.core.models import AnalysisConfig
+from mochi_analytics.integrations import get_organization_by_id, get_organizations
+from mochi_analytics.storage.database import get_db
 from mochi_analytics.storage.models import Job
+from mochi_analytics.workers import submit_job, run_organization_analysis_task
 
 router = APIRouter()
 
 
 @router.get("/organizations", response_model=OrganizationListResponse)
-async def list_organizations(active_only: bool = True) -> OrganizationListResponse:
+def list_organizations(active_only: bool = True) -> OrganizationListResponse:
     """
     List all organizations from Airtable.
     """
@@ -53,7 +54,7 @@ async def list_organizations(active_only: bool = True) -> OrganizationListRespon
 
 
 @router.get("/organizations/{org_id}", response_model=OrganizationResponse)
-async def get_organization(org_id: str) -> OrganizationResponse:
+def get_organization(org_id: str) -> OrganizationResponse:
     """
     Get organization details by ID.
     """
@@ -77,9 +78,13 @@ async def get_organization(org_id: str) -> OrganizationResponse:
 
 
 @router.post("/organizations/{org_id}/analyze", response_model=JobResponse)
-async def analyze_organization(org_id: str, request: OrganizationAnalysisRequest) -> JobResponse:
+def analyze_organization(
+    org_id: str,
+    request: OrganizationAnalysisRequest,
+    db: Session = Depends(get_db)
+) -> JobResponse:
     """
-    Fetch data from Mochi API and run analysis for an organization.
+    Queue a job that fetches data from Mochi API and runs analysis for an organization.
     """
     # Get organization config
     org = get_organization_by_id(org_id)
@@ -89,66 +94,32 @@ async def analyze_organization(org_id: str, request: OrganizationAnalysisRequest
     # Generate job ID
     job_id = str(uuid.uuid4())
 
-    # Create job record
-    session = get_session()
-    try:
-        job = Job(
-            id=job_id,
-            status=JobStatus.PROCESSING.value,
-            created_at=datetime.utcnow()
-        )
-        session.add(job)
-        session.commit()
-
-        # Fetch conversations from Mochi API
-        try:
-            conversations_data = fetch_conversations(
-                org_id=org_id,
-                date_from=request.date_from,
-                date_to=request.date_to
-            )
-
-            # Parse conversations
-            conversations = [Conversation.model_validate(c) for c in conversations_data]
-
-            # Build config
-            config = request.config or AnalysisConfig(
-                timezone=org.timezone,
-                start_date=request.date_from,
-                end_date=request.date_to
-            )
-
-            # Run analysis
-            result = analyze_conversations(
-                conversations=conversations,
-                config=config
-            )
-
-            # Update job with result
-            job.status = JobStatus.COMPLETED.value
-            job.completed_at = datetime.utcnow()
-            job.result = result.model_dump()
-            session.commit()
-
-            return JobResponse(job_id=job_id, status=JobStatus.COMPLETED)
-
-        except MochiAPIError as e:
-            # Update job with error
-            job.status = JobStatus.FAILED.value
-            job.completed_at = datetime.utcnow()
-            job.error = f"Mochi API error: {e}"
-            session.commit()
-
-            raise HTTPException(status_code=502, detail=f"Failed to fetch data from Mochi: {e}")
-
-        except Exception as e:
-            # Update job with error
-            job.status = JobStatus.FAILED.value
-            job.completed_at = datetime.utcnow()
-            job.error = str(e)
-            session.commit()
-
-            raise HTTPException(status_code=500, detail=f"Analysis failed: {e}")
-
-    finally:
-        session.close()
+    # Create job record with queued status
+    job = Job(
+        id=job_id,
+        status=JobStatus.QUEUED.value,
+        created_at=datetime.now(timezone.utc)
+    )
+    db.add(job)
+    db.commit()
+
+    # Build config
+    config = request.config or AnalysisConfig(
+        timezone=org.timezone,
+        start_date=request.date_from,
+        end_date=request.date_to
+    )
+    config_dict = config.model_dump()
+    config_dict["job_id"] = job_id  # Pass job_id for chart storage
+
+    # Submit job to background worker queue
+    submit_job(
+        run_organization_analysis_task,
+        org_id,
+        request.date_from,
+        request.date_to,
+        config_dict,
+        job_id=job_id
+    )
+
+    return JobResponse(job_id=job_id, status=JobStatus.QUEUED)
@@ -3,95 +3,127 @@ Reports API routes (Framer CMS integration).
 """
 
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, insert, select, tuple_
+from sqlalchemy.orm import Session
 
 from mochi_analytics.api.models import ReportResponse
+from mochi_analytics.api.pagination import decode_cursor, encode_cursor
 from mochi_analytics.core.models import AnalysisResult
-from mochi_analytics.storage.database import get_session
+from mochi_analytics.storage.database import get_db
 from mochi_analytics.storage.models import Report
 
 router = APIRouter()
 
 
+def queue_reports(db: Session, reports: list[dict], pushed: bool = False) -> list[str]:
+    """
+    Add report payloads to the Framer CMS queue and commit.
+
+    All rows go out as one bulk INSERT (batched into multi-row VALUES on
+    PostgreSQL) in a single transaction. Slugs are generated here, so no
+    RETURNING round-trip is needed.
+
+    Args:
+        db: Database session
+        reports: Report payloads
+        pushed: The reports were already pushed to Framer (sets pushed_at,
+            so they do not count towards the pending queue)
+
+    Returns:
+        Slugs of the queued reports, in input order
+    """
+    if not reports:
+        return []
+
+    created_at = datetime.now(timezone.utc)
+    pushed_at = created_at if pushed else None
+    rows = [
+        {"slug": str(uuid.uuid4()), "data": data, "created_at": created_at, "pushed_at": pushed_at}
+        for data in reports
+    ]
+    db.execute(insert(Report), rows)
+    db.commit()
+
+    return [row["slug"] for row in rows]
+
+
 @router.post("/reports", response_model=ReportResponse)
-async def create_report(result: AnalysisResult) -> ReportResponse:
+def create_report(result: AnalysisResult, db: Session = Depends(get_db)) -> ReportResponse:
     """
     Create a new report from analysis result.
 
     Stores the report in database queue for Framer CMS integration.
     """
-    slug = str(uuid.uuid4())
-
-    session = get_session()
-    try:
-        report = Report(
-            slug=slug,
-            data=result.model_dump(),
-            created_at=datetime.utcnow()
-        )
-        session.add(report)
-        session.commit()
-
-        # Get queue size
-        queue_size = session.query(Report).count()
+    slug, = queue_reports(db, [result.model_dump()])
 
-        # Extract chart IDs if available (from metadata or result)
-        chart_ids = []
-        # TODO: Extract chart IDs from result or generate them
+    # Get queue size (reports not yet pushed to Framer; served by ix_reports_unpushed)
+    queue_size = db.scalar(
+        select(func.count()).select_from(Report).where(Report.pushed_at.is_(None))
+    )
 
-        return ReportResponse(
-            slug=slug,
-            queue_size=queue_size,
-            chart_ids=chart_ids
-        )
+    # Extract chart IDs if available (from metadata or result)
+    chart_ids = []
+    # TODO: Extract chart IDs from result or generate them
 
-    finally:
-        session.close()
+    return ReportResponse(
+        slug=slug,
+        queue_size=queue_size,
+        chart_ids=chart_ids
+    )
 
 
 @router.get("/reports")
-async def list_reports(limit: int = 50, offset: int = 0):
+def list_reports(
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_db)
+):
     """
-    List all reports.
+    List reports, newest first.
+
+    Uses keyset pagination on (created_at, slug), so deep pages cost the
+    same as the first one.
     """
-    session = get_session()
-    try:
-        reports = (
-            session.query(Report)
-            .order_by(Report.created_at.desc())
-            .limit(limit)
-            .offset(offset)
-            .all()
-        )
-
-        return [
+    filters = []
+    if cursor:
+        filters.append(tuple_(Report.created_at, Report.slug) < decode_cursor(cursor))
+
+    # Only the listed columns; the data blob is left unread
+    reports = db.execute(
+        select(Report.slug, Report.created_at, Report.pushed_at)
+        .where(*filters)
+        .order_by(Report.created_at.desc(), Report.slug.desc())
+        .limit(limit)
+    ).all()
+
+    next_cursor = None
+    if len(reports) == limit:
+        next_cursor = encode_cursor(reports[-1].created_at, reports[-1].slug)
+
+    return {
+        "reports": [
             {
                 "slug": report.slug,
                 "created_at": report.created_at,
                 "pushed_at": report.pushed_at
             }
             for report in reports
-        ]
-
-    finally:
-        session.close()
+        ],
+        "next_cursor": next_cursor
+    }
 
 
 @router.get("/reports/{slug}")
-async def get_report(slug: str):
+def get_report(slug: str, db: Session = Depends(get_db)):
     """
     Get a specific report by slug.
     """
-    session = get_session()
-    try:
-        report = session.query(Report).filter(Report.slug == slug).first()
-
-        if not report:
-            raise HTTPException(status_code=404, detail="Report not found")
+    report = db.get(Report, slug)
 
-        return report.data
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
 
-    finally:
-        session.close()
+    return report.data
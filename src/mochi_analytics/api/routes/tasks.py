@@ -3,116 +3,141 @@ Scheduled tasks API routes.
 """
 
 import logging
-import threading
-from datetime import datetime, timedelta
-
-from fastapi import APIRouter, BackgroundTasks, HTTPException
-
-from mochi_analytics.api.models import TaskRequest, TaskResponse
-from mochi_analytics.integrations import get_organizations, get_slack_configs
-from mochi_analytics.workers import run_daily_updates_task
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from mochi_analytics.api.models import JobStatus, TaskRequest, TaskResponse
+from mochi_analytics.api.routes.jobs import build_job_status_payload
+from mochi_analytics.api.routes.reports import queue_reports
+from mochi_analytics.integrations import OrganizationConfig, get_organizations, get_slack_configs
+from mochi_analytics.storage.database import get_db
+from mochi_analytics.storage.models import Job
+from mochi_analytics.workers import run_daily_updates_task, submit_job
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Store last task result for debugging
-_last_task_result = {"status": "no task run yet", "timestamp": None}
+# Maximum organizations exported in parallel by run_auto_export
+AUTO_EXPORT_CONCURRENCY = int(os.getenv("AUTO_EXPORT_CONCURRENCY", "8"))
 
+# SlackDailyConfig fields shown by /tasks/slack-configs
+_SLACK_CONFIG_DEBUG_FIELDS = {
+    "record_id",
+    "organization_id",
+    "slack_channel",
+    "stage_labels",
+    "script_configs",
+    "schedule_time",
+    "active",
+}
 
-def run_daily_updates_background(dry_run: bool, org_filter: str | None, force_send: bool):
-    """Run daily updates in background thread."""
-    global _last_task_result
-    try:
-        logger.info(f"Background task started: dry_run={dry_run}, org_filter={org_filter}, force_send={force_send}")
-        _last_task_result = {
-            "status": "running",
-            "started_at": datetime.utcnow().isoformat(),
-            "org_filter": org_filter
-        }
-        result = run_daily_updates_task(
-            dry_run=dry_run,
-            org_filter=org_filter,
-            force_send=force_send
-        )
-        logger.info(f"Background task completed: {result}")
-        _last_task_result = {
-            "status": "completed",
-            "finished_at": datetime.utcnow().isoformat(),
-            "result": result
-        }
-    except Exception as e:
-        import traceback
-        error_details = traceback.format_exc()
-        logger.error(f"Background task failed: {e}\n{error_details}")
-        _last_task_result = {
-            "status": "failed",
-            "finished_at": datetime.utcnow().isoformat(),
-            "error": str(e),
-            "traceback": error_details
-        }
+# Job.kind of daily-updates runs (for /tasks/status)
+DAILY_UPDATES_JOB_KIND = "daily_updates"
 
 
 @router.post("/tasks/daily-updates", response_model=TaskResponse)
-async def run_daily_updates(request: TaskRequest, background_tasks: BackgroundTasks) -> TaskResponse:
+def run_daily_updates(request: TaskRequest, db: Session = Depends(get_db)) -> TaskResponse:
     """
     Run daily Slack update task.
 
     Set force_send=True for manual runs (send immediately, ignore schedule).
     Set force_send=False for automated cron (respect each org's schedule_time).
 
-    Task runs in background - returns immediately.
+    Task is queued on the background worker queue - returns immediately.
+    Its summary is stored as the job result (see /tasks/status or /jobs/{job_id}).
     """
-    # Run in background to avoid Render timeout
-    background_tasks.add_task(
-        run_daily_updates_background,
-        request.dry_run,
-        request.org_filter,
-        request.force_send
+    job_id = str(uuid.uuid4())
+
+    # Create job record with queued status
+    job = Job(
+        id=job_id,
+        status=JobStatus.QUEUED.value,
+        kind=DAILY_UPDATES_JOB_KIND,
+        created_at=datetime.now(timezone.utc)
+    )
+    db.add(job)
+    db.commit()
+
+    submit_job(
+        run_daily_updates_task,
+        dry_run=request.dry_run,
+        org_filter=request.org_filter,
+        force_send=request.force_send,
+        job_id=job_id
     )
 
     return TaskResponse(
-        status="started",
-        message=f"Task started in background for org_filter={request.org_filter}",
+        status="queued",
+        message=f"Task queued for org_filter={request.org_filter}",
         jobs_created=0,
-        errors=[]
+        errors=[],
+        job_id=job_id
     )
 
 
-@router.post("/tasks/auto-export", response_model=TaskResponse)
-async def run_auto_export(request: TaskRequest) -> TaskResponse:
+def export_organization(org: OrganizationConfig, dry_run: bool) -> dict | None:
     """
-    Run automatic export task for Framer CMS.
+    Generate and push the weekly Framer report for one organization.
 
-    Generates weekly reports and pushes them to Framer.
+    Returns the pushed report payload to store, or None if nothing should be
+    stored (always None on dry runs, so they never touch the Framer queue).
+    Raises on failure; run_auto_export records the error and moves on.
     """
-    try:
-        # Get all active organizations
-        orgs = get_organizations(active_only=True)
+    # TODO: Implement auto-export logic
+    # 1. Calculate date range (last 7 days)
+    # 2. Fetch conversations
+    # 3. Run full analysis
+    # 4. Push to Framer CMS
+    # (run_auto_export stores the returned reports in one batch)
 
-        if request.org_filter:
-            # Filter by name
-            orgs = [o for o in orgs if request.org_filter.lower() in o.organization_name.lower()]
+    if dry_run:
+        return None
 
-        jobs_created = 0
-        errors = []
+    # Actually create and push the report
+    return None
 
-        for org in orgs:
-            try:
-                # TODO: Implement auto-export logic
-                # 1. Calculate date range (last 7 days)
-                # 2. Fetch conversations
-                # 3. Run full analysis
-                # 4. Push to Framer CMS
-                # 5. Store report in database
 
-                if not request.dry_run:
-                    # Actually create and push the report
-                    pass
+@router.post("/tasks/auto-export", response_model=TaskResponse)
+def run_auto_export(request: TaskRequest, db: Session = Depends(get_db)) -> TaskResponse:
+    """
+    Run automatic export task for Framer CMS.
 
-                jobs_created += 1
+    Generates weekly reports and pushes them to Framer. Organizations are
+    independent, so up to AUTO_EXPORT_CONCURRENCY are exported at once;
+    the cap keeps Mochi/Framer request rates bounded. Generated reports are
+    stored together in one insert once all organizations are done.
+    """
+    try:
+        # Get active organizations, filtered by name in Airtable if requested
+        orgs = get_organizations(active_only=True, name_contains=request.org_filter)
 
-            except Exception as e:
-                errors.append(f"Failed for org {org.organization_name}: {e}")
+        jobs_created = 0
+        errors = []
+        reports = []
+
+        with ThreadPoolExecutor(max_workers=AUTO_EXPORT_CONCURRENCY) as executor:
+            futures = {
+                executor.submit(export_organization, org, request.dry_run): org
+                for org in orgs
+            }
+            for future in as_completed(futures):
+                try:
+                    report = future.result()
+                    jobs_created += 1
+                except Exception as e:
+                    errors.append(f"Failed for org {futures[future].organization_name}: {e}")
+                    continue
+                if report is not None:
+                    reports.append(report)
+
+        # export_organization returns only reports it has pushed
+        queue_reports(db, reports, pushed=True)
 
         return TaskResponse(
             status="completed",
@@ -126,35 +151,53 @@ async def run_auto_export(request: TaskRequest) -> TaskResponse:
 
 
 @router.get("/tasks/status")
-async def get_task_status():
+def get_task_status(db: Session = Depends(get_db)):
     """
-    Get the status of the last background task.
+    Get the status of the most recently queued daily-updates job.
+
+    Read from the jobs table (ix_jobs_kind_created), so it survives restarts
+    and is the same on every replica.
     """
-    return _last_task_result
+    job = db.scalars(
+        select(Job)
+        .where(Job.kind == DAILY_UPDATES_JOB_KIND)
+        .order_by(Job.created_at.desc())
+        .limit(1)
+    ).first()
+
+    if not job:
+        return {"status": "no task run yet", "timestamp": None}
+
+    return build_job_status_payload(job)
 
 
 @router.get("/tasks/debug-daily/{org_name}")
-async def debug_daily_update(org_name: str):
+def debug_daily_update(org_name: str):
     """
     Debug endpoint to see what data would be sent for a daily update.
 
     Returns the processed data (summary, scripts, groups) without sending to Slack.
     """
     from datetime import timedelta
-    import pytz
 
-    from mochi_analytics.core.models import Conversation
+    from mochi_analytics.core.models import CONVERSATION_LIST_ADAPTER
     from mochi_analytics.core.analyzer import analyze_conversations_simplified
-    from mochi_analytics.core.script_search import run_script_searches
-    from mochi_analytics.integrations import fetch_conversations, get_organization_by_id
+    from mochi_analytics.core.script_search import (
+        build_script_search_corpus,
+        run_grouped_script_searches,
+        run_script_searches,
+    )
+    from mochi_analytics.core.timestamps import get_timezone
+    from mochi_analytics.integrations import fetch_conversations, get_organizations_by_ids
 
     try:
         # Find matching config
         configs = get_slack_configs(active_only=True)
+        orgs_by_id = get_organizations_by_ids(c.organization_id for c in configs)
         matching_config = None
 
         for config in configs:
-            org = get_organization_by_id(config.organization_id)
+            org = orgs_by_id.get(config.organization_id)
             if org and org_name.lower() in org.organization_name.lower():
                 matching_config = config
                 matching_org = org
@@ -164,7 +207,7 @@ async def debug_daily_update(org_name: str):
             raise HTTPException(status_code=404, detail=f"No config found for org matching '{org_name}'")
 
         # Calculate yesterday in org's timezone
-        org_tz = pytz.timezone(matching_org.timezone)
+        org_tz = get_timezone(matching_org.timezone)
         org_now = datetime.now(org_tz)
         yesterday_org_tz = (org_now - timedelta(days=1)).date()
 
@@ -178,7 +221,8 @@ async def debug_daily_update(org_name: str):
             date_to=fetch_to
         )
 
-        conversations = [Conversation.model_validate(c) for c in conversations_data]
+        conversations = CONVERSATION_LIST_ADAPTER.validate_python(conversations_data)
+        del conversations_data  # Release the raw payload before analysis
 
         # Run analysis
         result = analyze_conversations_simplified(
@@ -188,6 +232,16 @@ async def debug_daily_update(org_name: str):
             end_date=yesterday_org_tz
         )
 
+        # Creator messages from yesterday, scanned once for script and grouped searches
+        corpus = None
+        if matching_config.script_configs or matching_config.grouped_configs:
+            corpus = build_script_search_corpus(
+                conversations,
+                timezone=matching_org.timezone,
+                date_from=yesterday_org_tz,
+                date_to=yesterday_org_tz
+            )
+
         # Run script searches
         script_results_data = []
         if matching_config.script_configs:
@@ -195,7 +249,8 @@ async def debug_daily_update(org_name: str):
                 conversations=conversations,
                 script_configs=matching_config.script_configs,
                 timezone=matching_org.timezone,
-                target_date=yesterday_org_tz
+                target_date=yesterday_org_tz,
+                corpus=corpus
             )
             script_results_data = [
                 {"label": r.label, "total_matches": r.total_matches}
@@ -205,18 +260,17 @@ async def debug_daily_update(org_name: str):
         # Run grouped analysis
         grouped_results_data = []
         if matching_config.grouped_configs:
-            for group in matching_config.grouped_configs:
-                member_results = run_script_searches(
-                    conversations=conversations,
-                    script_configs=group.member_configs,
-                    timezone=matching_org.timezone,
-                    target_date=yesterday_org_tz
-                )
-                total_matches = sum(r.total_matches for r in member_results)
-                grouped_results_data.append({
-                    "label": group.label,
-                    "total_matches": total_matches
-                })
+            grouped_results = run_grouped_script_searches(
+                conversations=conversations,
+                grouped_configs=matching_config.grouped_configs,
+                timezone=matching_org.timezone,
+                target_date=yesterday_org_tz,
+                corpus=corpus
+            )
+            grouped_results_data = [
+                {"label": r.label, "total_matches": r.total_matches}
+                for r in grouped_results
+            ]
 
         return {
             "org_name": matching_org.organization_name,
@@ -237,14 +291,16 @@ async def debug_daily_update(org_name: str):
 
 
 @router.get("/tasks/slack-configs")
-async def debug_slack_configs():
+def debug_slack_configs():
     """
     Debug endpoint to see what Slack configurations are available.
+
+    Plain def: the Airtable client is synchronous, so this runs in the threadpool.
     """
     try:
         # Get raw records to see what's in Airtable
-        from mochi_analytics.integrations.airtable import AirtableClient
-        client = AirtableClient()
+        from mochi_analytics.integrations import AirtableClient, get_shared_client
+        client = get_shared_client(AirtableClient)
 
         # Get ALL records (active and inactive)
         all_records = client.slack_table.all()
@@ -268,18 +324,8 @@ async def debug_slack_configs():
                 for r in all_records
             ],
             "total_configs": len(configs),
-            "configs": [
-                {
-                    "record_id": c.record_id,
-                    "organization_id": c.organization_id,
-                    "slack_channel": c.slack_channel,
-                    "stage_labels": c.stage_labels,
-                    "script_configs": [s.model_dump() for s in c.script_configs],
-                    "schedule_time": c.schedule_time,
-                    "active": c.active
-                }
-                for c in configs
-            ]
+            # One serializer call per config (nested script configs included)
+            "configs": [c.model_dump(include=_SLACK_CONFIG_DEBUG_FIELDS) for c in configs]
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get Slack configs: {str(e)}")
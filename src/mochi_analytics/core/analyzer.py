@@ -5,14 +5,17 @@ from datetime import datetime, date
 from mochi_analytics.core.models import (
     Conversation,
     AnalysisConfig,
-    AnalysisResult
+    AnalysisResult,
+    TimeSeries
 )
+from mochi_analytics.core.batch import ConversationBatch
 from mochi_analytics.core.metrics import calculate_core_metrics
 from mochi_analytics.core.setters import (
-    analyze_setters_by_sender,
-    analyze_setters_by_assignment
+    analyze_setters,
+    analyze_setters_by_sender
 )
 from mochi_analytics.core.time_series import analyze_time_series
+from mochi_analytics.core.timestamps import parse_timestamp
 
 # LLM features imported conditionally
 try:
@@ -46,8 +49,9 @@ def analyze_conversations(
         # Auto-detect from conversations
         start_date, end_date = detect_date_range(conversations)
 
-    # Core metrics
-    summary = calculate_core_metrics(conversations)
+    # Core metrics (messages and timestamps are parsed once into a batch)
+    batch = ConversationBatch.from_conversations(conversations)
+    summary = calculate_core_metrics(conversations, batch=batch)
 
     # Time series
     time_series = analyze_time_series(
@@ -58,36 +62,31 @@ def analyze_conversations(
     )
 
     # Setter analysis (both modes)
-    setters_by_sender = analyze_setters_by_sender(conversations)
-    setters_by_assignment = analyze_setters_by_assignment(conversations)
-
-    # Convert SetterMetrics to dict for JSON serialization
-    setters_by_sender_dict = {
-        k: v.model_dump() for k, v in setters_by_sender.items()
-    }
-    setters_by_assignment_dict = {
-        k: v.model_dump() for k, v in setters_by_assignment.items()
-    }
+    setters_by_sender, setters_by_assignment = analyze_setters(conversations, batch=batch)
 
     # LLM features (optional based on config and availability)
     scripts_result = None
     if config.include_scripts and HAS_LLM:
         scripts_result = analyze_scripts(
             conversations,
-            similarity_threshold=config.similarity_threshold
+            similarity_threshold=config.similarity_threshold,
+            max_concurrent_api_calls=config.max_concurrent_api_calls
         )
     elif config.include_scripts and not HAS_LLM:
         print("Warning: Scripts analysis requested but LLM dependencies not installed")
 
     objections_result = None
     if config.include_objections and HAS_LLM:
-        objections_result = analyze_objections(conversations)
+        objections_result = analyze_objections(
+            conversations,
+            max_concurrent_api_calls=config.max_concurrent_api_calls
+        )
     elif config.include_objections and not HAS_LLM:
         print("Warning: Objections analysis requested but LLM dependencies not installed")
 
     avatars_result = None
     if config.include_avatars and HAS_LLM:
-        avatars_result = analyze_avatars(conversations)
+        avatars_result = analyze_avatars(conversations, batch=batch)
     elif config.include_avatars and not HAS_LLM:
         print("Warning: Avatars analysis requested but LLM dependencies not installed")
 
@@ -113,8 +112,9 @@ def analyze_conversations(
         metadata=metadata,
         summary=summary,
         time_series=time_series,
-        setters_by_sent_by=setters_by_sender_dict,
-        setters_by_assignment=setters_by_assignment_dict,
+        # SetterMetrics instances are stored as-is (no dump/re-validate round trip)
+        setters_by_sent_by=setters_by_sender,
+        setters_by_assignment=setters_by_assignment,
         scripts=scripts_result,
         objections=objections_result,
         avatars=avatars_result
@@ -130,25 +130,30 @@ def detect_date_range(conversations: List[Conversation]) -> tuple[date, date]:
     Returns:
         (start_date, end_date) tuple
     """
-    if not conversations:
-        today = date.today()
-        return today, today
-
-    # Parse all timestamps
-    dates = []
+    # Single pass keeping only the running min/max
+    start = end = None
     for conv in conversations:
+        timestamp = conv.created_at
         try:
-            from mochi_analytics.core.metrics import parse_timestamp
-            conv_time = parse_timestamp(conv.created_at)
-            dates.append(conv_time.date())
+            if timestamp[10:11] in ("", "T"):
+                # Date-only or "YYYY-MM-DDT...": the (local) date is the prefix,
+                # so skip the full datetime parse
+                conv_date = date.fromisoformat(timestamp[:10])
+            else:
+                conv_date = parse_timestamp(timestamp).date()
         except Exception:
             continue
 
-    if not dates:
+        if start is None or conv_date < start:
+            start = conv_date
+        if end is None or conv_date > end:
+            end = conv_date
+
+    if start is None:
         today = date.today()
         return today, today
 
-    return min(dates), max(dates)
+    return start, end
 
 
 def analyze_conversations_simplified(
@@ -164,8 +169,8 @@ def analyze_conversations_simplified(
     - Core metrics
     - Setters by_sent_by
 
-    Skips:
-    - Time series (not needed for Slack)
+    Skips (returned empty, not computed):
+    - Time series (not needed for Slack; analysis_period is in metadata)
     - Setters by_assignment (not needed for Slack)
     - Scripts (LLM, expensive)
     - Objections (LLM, expensive)
@@ -175,22 +180,12 @@ def analyze_conversations_simplified(
     if not start_date or not end_date:
         start_date, end_date = detect_date_range(conversations)
 
-    # Core metrics
-    summary = calculate_core_metrics(conversations)
+    # Core metrics (messages and timestamps are parsed once into a batch)
+    batch = ConversationBatch.from_conversations(conversations)
+    summary = calculate_core_metrics(conversations, batch=batch)
 
     # Setter analysis (by sender only)
-    setters_by_sender = analyze_setters_by_sender(conversations)
-    setters_by_sender_dict = {
-        k: v.model_dump() for k, v in setters_by_sender.items()
-    }
-
-    # Minimal time series (for metadata)
-    time_series = analyze_time_series(
-        conversations,
-        start_date,
-        end_date,
-        timezone
-    )
+    setters_by_sender = analyze_setters_by_sender(conversations, batch=batch)
 
     # Build metadata
     metadata = {
@@ -212,8 +207,8 @@ def analyze_conversations_simplified(
     return AnalysisResult(
         metadata=metadata,
         summary=summary,
-        time_series=time_series,
-        setters_by_sent_by=setters_by_sender_dict,
+        time_series=TimeSeries(),  # Empty for simplified analysis
+        setters_by_sent_by=setters_by_sender,
         setters_by_assignment={},  # Empty for simplified analysis
         scripts=None,
         objections=None,
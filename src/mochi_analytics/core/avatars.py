@@ -1,18 +1,33 @@
 """Avatar clustering - identify lead personas using embeddings and K-means."""
 
-from typing import List, Dict, Optional
-from sklearn.cluster import KMeans
-from mochi_analytics.core.models import Conversation
-from mochi_analytics.core.llm import generate_embedding, generate_structured_output
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import List, Dict, Optional, Sequence, Tuple
+import numpy as np
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from mochi_analytics.core.models import Conversation, Message
+from mochi_analytics.core.batch import ConversationBatch
+from mochi_analytics.core.llm import generate_embeddings, generate_structured_output
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Above this many embeddings, cluster with MiniBatchKMeans instead of full-batch KMeans
+MINIBATCH_KMEANS_THRESHOLD = 5000
+
+# Cluster counts tried when analyze_avatars picks the number of avatars itself
+AVATAR_CLUSTER_CANDIDATES = (3, 4, 5, 6, 7)
+
+# Silhouette scores are O(n^2); score on at most this many points
+SILHOUETTE_SAMPLE_SIZE = 1000
+
 
 def analyze_avatars(
     conversations: List[Conversation],
-    n_clusters: int = 5,
-    min_messages: int = 3
+    n_clusters: Optional[int] = None,
+    min_messages: int = 3,
+    batch: Optional[ConversationBatch] = None
 ) -> Dict:
     """
     Cluster conversations by lead characteristics using K-means on embeddings.
@@ -21,91 +36,107 @@ def analyze_avatars(
     1. Filter out funnel triggers (automated/bot conversations)
     2. Extract first N LEAD messages per conversation
     3. Generate embeddings using Gemini
-    4. Cluster using K-means
+    4. Cluster using K-means (picking the cluster count by silhouette score
+       unless n_clusters is given)
     5. Generate avatar profiles from cluster samples
 
     Args:
         conversations: List of conversations
-        n_clusters: Number of avatar clusters
+        n_clusters: Number of avatar clusters (chosen from
+            AVATAR_CLUSTER_CANDIDATES if omitted)
         min_messages: Minimum LEAD messages required
+        batch: Prebuilt ConversationBatch for these conversations (built if omitted)
 
     Returns:
         Dict with avatars list and metadata
     """
+    if batch is None:
+        batch = ConversationBatch.from_conversations(conversations)
+
+    min_clusters = n_clusters or min(AVATAR_CLUSTER_CANDIDATES)
+
     # Step 1: Filter funnel triggers
-    real_conversations = filter_funnel_triggers(conversations)
+    real_indices = find_real_conversations(batch)
 
-    if len(real_conversations) < n_clusters:
-        logger.warning(f"Only {len(real_conversations)} conversations, need {n_clusters}")
+    if len(real_indices) < min_clusters:
+        logger.warning(f"Only {len(real_indices)} conversations, need {min_clusters}")
         return build_empty_avatars_result()
 
-    logger.info(f"Filtered to {len(real_conversations)} real conversations")
+    logger.info(f"Filtered to {len(real_indices)} real conversations")
 
-    # Step 2: Extract lead text (first 3 messages)
+    # Step 2: Extract lead text (first 3 messages), reusing the batch's parsed messages
     conversation_texts = []
     valid_conversations = []
 
-    for conv in real_conversations:
-        text = extract_lead_text(conv, max_messages=min_messages)
+    for i in real_indices:
+        conv = batch.conversations[i]
+        text = extract_lead_text(conv, max_messages=min_messages, messages=batch.conversation_messages(i))
         if text:
             conversation_texts.append(text)
             valid_conversations.append(conv)
 
-    if len(valid_conversations) < n_clusters:
+    if len(valid_conversations) < min_clusters:
         logger.warning(f"Only {len(valid_conversations)} valid conversations")
         return build_empty_avatars_result()
 
     logger.info(f"Extracted text from {len(valid_conversations)} conversations")
 
-    # Step 3: Generate embeddings
+    # Step 3: Generate embeddings (batched, one API request per 100 texts)
     try:
-        embeddings = [generate_embedding(text) for text in conversation_texts]
+        embeddings = generate_embeddings(conversation_texts)
     except Exception as e:
         logger.error(f"Failed to generate embeddings: {e}")
         return build_empty_avatars_result()
 
     logger.info(f"Generated {len(embeddings)} embeddings")
 
-    # Step 4: K-means clustering
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-    labels = kmeans.fit_predict(embeddings)
+    # Step 4: K-means clustering (one contiguous float32 matrix). Rows are
+    # L2-normalized so Euclidean k-means groups by cosine similarity, the
+    # metric Gemini embeddings are meant to be compared with
+    X = np.asarray(embeddings, dtype=np.float32)
+    X /= np.linalg.norm(X, axis=1, keepdims=True) + 1e-12
+    if n_clusters is None:
+        n_clusters, labels = select_clusters(X, AVATAR_CLUSTER_CANDIDATES)
+        logger.info(f"Selected {n_clusters} clusters by silhouette score")
+    else:
+        labels = fit_clusters(X, n_clusters)
+
+    # Group conversation indices by cluster in one pass: a stable sort keeps
+    # each cluster's members in their original order
+    order = np.argsort(labels, kind="stable")
+    counts = np.bincount(labels, minlength=n_clusters)
+    offsets = np.concatenate(([0], np.cumsum(counts)))
 
     # Step 5: Generate avatar profiles
-    avatars = []
+    clusters = []
     for cluster_id in range(n_clusters):
-        # Get conversations in this cluster
-        cluster_convs = [
-            valid_conversations[i]
-            for i in range(len(valid_conversations))
-            if labels[i] == cluster_id
-        ]
-
-        if not cluster_convs:
+        cluster_size = int(counts[cluster_id])
+        if not cluster_size:
             continue
 
-        # Take sample for profile generation
-        sample_size = min(3, len(cluster_convs))
-        sample = cluster_convs[:sample_size]
-
-        # Generate profile
-        try:
-            profile = generate_avatar_profile(sample)
-        except Exception as e:
-            logger.warning(f"Failed to generate profile for cluster {cluster_id}: {e}")
-            profile = {
-                "job": "Unknown",
-                "age_range": "Unknown",
-                "motivation": "Unknown",
-                "main_objection": "Unknown"
-            }
+        # Take sample (first members) for profile generation
+        sample_size = min(3, cluster_size)
+        start = offsets[cluster_id]
+        sample = [valid_conversations[i] for i in order[start:start + sample_size]]
+        clusters.append((cluster_id, cluster_size, sample))
+
+    # One Gemini request per cluster; they are independent, so run them concurrently
+    with ThreadPoolExecutor(max_workers=max(len(clusters), 1)) as executor:
+        profiles = list(executor.map(
+            generate_avatar_profile_or_unknown,
+            [cluster_id for cluster_id, _, _ in clusters],
+            [sample for _, _, sample in clusters]
+        ))
 
+    avatars = []
+    for (cluster_id, cluster_size, sample), profile in zip(clusters, profiles):
         # Build avatar dict
-        percentage = (len(cluster_convs) / len(valid_conversations) * 100)
+        percentage = (cluster_size / len(valid_conversations) * 100)
 
         avatars.append({
             "id": f"avatar_{cluster_id + 1}",
             "cluster_id": cluster_id,
-            "conversation_count": len(cluster_convs),
+            "conversation_count": cluster_size,
             "percentage": round(percentage, 1),
             "job": profile.get("job", "Unknown"),
             "age_range": profile.get("age_range", "Unknown"),
@@ -124,6 +155,53 @@ def analyze_avatars(
     }
 
 
+def fit_clusters(X: np.ndarray, n_clusters: int, n_init: Optional[int] = None) -> np.ndarray:
+    """
+    K-means cluster labels for the rows of X.
+
+    n_init overrides the number of initializations (default 3 for
+    MiniBatchKMeans, 10 for KMeans).
+    """
+    if len(X) > MINIBATCH_KMEANS_THRESHOLD:
+        kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=42, n_init=n_init or 3, batch_size=1024)
+    else:
+        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=n_init or 10, algorithm="elkan", copy_x=False)
+    return kmeans.fit_predict(X)
+
+
+def select_clusters(X: np.ndarray, candidates: Sequence[int]) -> Tuple[int, np.ndarray]:
+    """
+    Pick the cluster count with the best silhouette score.
+
+    The sweep is kept cheap: each candidate gets a single-initialization
+    fit and a sampled silhouette score. Only the chosen count is then
+    refitted with the full number of initializations.
+
+    Args:
+        X: Normalized embeddings, one row per conversation
+        candidates: Cluster counts to try
+
+    Returns:
+        Tuple of (chosen cluster count, labels)
+    """
+    # Silhouette needs 2 <= k < number of points
+    usable = [k for k in candidates if 2 <= k < len(X)] or [min(candidates)]
+    if len(usable) == 1:
+        return usable[0], fit_clusters(X, usable[0])
+
+    sample_size = min(len(X), SILHOUETTE_SAMPLE_SIZE)
+    best_k, best_score = usable[0], -np.inf
+    for k in usable:
+        labels = fit_clusters(X, k, n_init=1)
+        if len(np.unique(labels)) < 2:
+            continue
+        score = silhouette_score(X, labels, sample_size=sample_size, random_state=42)
+        if score > best_score:
+            best_k, best_score = k, score
+
+    return best_k, fit_clusters(X, best_k)
+
+
 def filter_funnel_triggers(conversations: List[Conversation]) -> List[Conversation]:
     """
     Filter out automated funnel triggers.
@@ -139,49 +217,47 @@ def filter_funnel_triggers(conversations: List[Conversation]) -> List[Conversati
     Returns:
         Filtered list of real conversations
     """
-    real_conversations = []
+    batch = ConversationBatch.from_conversations(conversations)
+    return [conversations[i] for i in find_real_conversations(batch)]
 
-    for conv in conversations:
-        messages = conv.get_actual_messages()
-
-        # Must have at least 2 messages
-        if len(messages) < 2:
-            continue
 
-        # Must have at least one LEAD message
-        lead_messages = [m for m in messages if m.sender == "LEAD"]
-        if not lead_messages:
-            continue
+def find_real_conversations(batch: ConversationBatch) -> np.ndarray:
+    """
+    Indices of the batch's conversations that pass the funnel-trigger filter.
 
-        # LEAD messages must have substance (not just "ok", "hi", etc.)
-        substantial = [m for m in lead_messages if len(m.content.strip()) >= 10]
-        if not substantial:
-            continue
+    Same heuristics as filter_funnel_triggers, evaluated with per-message
+    arrays instead of a Python loop over each conversation's messages.
+    """
+    # Must have at least 2 messages
+    enough_messages = batch.message_counts >= 2
 
-        real_conversations.append(conv)
+    # Must have a LEAD message with substance (not just "ok", "hi", etc.),
+    # which also covers "at least one LEAD message"
+    substantial_leads = batch.count_per_conversation(batch.is_lead & (batch.content_lengths >= 10))
 
-    return real_conversations
+    return np.flatnonzero(enough_messages & (substantial_leads > 0))
 
 
-def extract_lead_text(conv: Conversation, max_messages: int = 3) -> Optional[str]:
+def extract_lead_text(
+    conv: Conversation,
+    max_messages: int = 3,
+    messages: Optional[List[Message]] = None
+) -> Optional[str]:
     """
     Extract first N LEAD messages as combined text.
 
     Args:
         conv: Conversation
         max_messages: Max number of LEAD messages to include
+        messages: conv's actual messages, if already parsed
 
     Returns:
         Combined text or None if insufficient
     """
-    messages = conv.get_actual_messages()
-    lead_messages = [m for m in messages if m.sender == "LEAD"]
-
-    if not lead_messages:
-        return None
-
-    # Take first N messages
-    selected = lead_messages[:max_messages]
+    if messages is None:
+        messages = conv.get_actual_messages()
+    # Take first N LEAD messages, stopping the scan once they are found
+    selected = islice((m for m in messages if m.sender == "LEAD"), max_messages)
     combined = " ".join([m.content.strip() for m in selected])
 
     return combined if combined else None
@@ -226,12 +302,31 @@ Return JSON with these fields:
 Return ONLY valid JSON, no other text.
 Example: {{"job": "Entrepreneur", "age_range": "30-40", "motivation": "...", "main_objection": "..."}}"""
 
+    # Cached profiles are only shared within an organization, and matched
+    # on the conversation excerpts rather than the fixed prompt template
+    organizations = ",".join(sorted({conv.organization_id for conv in conversations}))
     return generate_structured_output(
         prompt=prompt,
-        expected_fields=["job", "age_range", "motivation", "main_objection"]
+        expected_fields=["job", "age_range", "motivation", "main_objection"],
+        cache_scope=f"avatar_profile|{organizations}",
+        cache_text=combined
     )
 
 
+def generate_avatar_profile_or_unknown(cluster_id: int, conversations: List[Conversation]) -> Dict:
+    """Generate a cluster's avatar profile, falling back to "Unknown" fields on failure."""
+    try:
+        return generate_avatar_profile(conversations)
+    except Exception as e:
+        logger.warning(f"Failed to generate profile for cluster {cluster_id}: {e}")
+        return {
+            "job": "Unknown",
+            "age_range": "Unknown",
+            "motivation": "Unknown",
+            "main_objection": "Unknown"
+        }
+
+
 def build_empty_avatars_result() -> Dict:
     """Build empty result structure."""
     return {
@@ -0,0 +1,155 @@
+"""Array-based (structure-of-arrays) view of conversations for vectorized analytics."""
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import List
+
+import numpy as np
+
+from mochi_analytics.core.models import Conversation, Message
+from mochi_analytics.core.timestamps import parse_timestamp, to_epoch_seconds
+
+# Sender codes stored in ConversationBatch.senders
+SENDER_OTHER = 0
+SENDER_LEAD = 1
+SENDER_CREATOR = 2
+
+SENDER_CODES = {"LEAD": SENDER_LEAD, "CREATOR": SENDER_CREATOR}
+
+
+@dataclass
+class ConversationBatch:
+    """
+    Flattened message timeline for a list of conversations.
+
+    Actual messages (status changes filtered out) are laid out back to back
+    in conversation order. The messages of conversation i occupy positions
+    conv_offsets[i]:conv_offsets[i + 1] in every per-message array.
+    Timestamps are parsed once here so analytics passes only touch the
+    contiguous arrays they need.
+    """
+
+    conversations: List[Conversation]
+    messages: List[Message]
+    conv_offsets: np.ndarray  # int64, len(conversations) + 1
+    timestamps: np.ndarray  # float64 epoch seconds
+    senders: np.ndarray  # int8 sender codes
+
+    @classmethod
+    def from_conversations(cls, conversations: List[Conversation]) -> "ConversationBatch":
+        """Build a batch, parsing messages and timestamps once."""
+        messages: List[Message] = []
+        offsets = [0]
+        for conv in conversations:
+            messages.extend(conv.get_actual_messages())
+            offsets.append(len(messages))
+
+        n = len(messages)
+        return cls(
+            conversations=conversations,
+            messages=messages,
+            conv_offsets=np.asarray(offsets, dtype=np.int64),
+            timestamps=np.fromiter(
+                (to_epoch_seconds(m.timestamp) for m in messages), dtype=np.float64, count=n
+            ),
+            senders=np.fromiter(
+                (SENDER_CODES.get(m.sender, SENDER_OTHER) for m in messages), dtype=np.int8, count=n
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    @cached_property
+    def conv_index(self) -> np.ndarray:
+        """Conversation number of each message."""
+        return np.repeat(np.arange(len(self.conversations)), self.message_counts)
+
+    @cached_property
+    def is_lead(self) -> np.ndarray:
+        return self.senders == SENDER_LEAD
+
+    @cached_property
+    def is_creator(self) -> np.ndarray:
+        return self.senders == SENDER_CREATOR
+
+    @cached_property
+    def content_lengths(self) -> np.ndarray:
+        """Length of each message's content after stripping whitespace."""
+        return np.fromiter(
+            (len(m.content.strip()) for m in self.messages), dtype=np.int32, count=len(self.messages)
+        )
+
+    @cached_property
+    def time_bins(self) -> np.ndarray:
+        """
+        TIME_BINS index of each message (3-hour bins of the hour of day).
+
+        Uses the wall-clock hour as written in the timestamp (its own UTC
+        offset), matching get_time_bin(parse_timestamp(...).hour).
+        """
+        return np.fromiter(
+            (parse_timestamp(m.timestamp).hour // 3 for m in self.messages), dtype=np.int8, count=len(self.messages)
+        )
+
+    @cached_property
+    def creator_reply_delays(self) -> np.ndarray:
+        """
+        Delay to the next lead message for each creator message (inf if none).
+
+        Shared by core metrics and both setter analyses.
+        """
+        return find_reply_delays(self.timestamps, self.is_lead, self.is_creator, self.conv_index)
+
+    @cached_property
+    def message_counts(self) -> np.ndarray:
+        """Number of actual messages in each conversation."""
+        return np.diff(self.conv_offsets)
+
+    def count_per_conversation(self, mask: np.ndarray) -> np.ndarray:
+        """Number of messages matching a per-message boolean mask, per conversation."""
+        return np.bincount(self.conv_index[mask], minlength=len(self.conversations))
+
+    def conversation_messages(self, i: int) -> List[Message]:
+        """Messages of conversation i."""
+        return self.messages[self.conv_offsets[i]:self.conv_offsets[i + 1]]
+
+
+def find_reply_delays(
+    timestamps: np.ndarray,
+    is_lead: np.ndarray,
+    is_creator: np.ndarray,
+    conv_index: np.ndarray
+) -> np.ndarray:
+    """
+    Compute the reply delay for every creator message in one vectorized pass.
+
+    All arrays describe the same flattened message timeline, in conversation
+    order. For each creator message the next lead message is located with a
+    binary search over lead positions; it only counts if it belongs to the
+    same conversation.
+
+    Args:
+        timestamps: Epoch seconds per message (float64)
+        is_lead: True where the message was sent by the lead
+        is_creator: True where the message was sent by the creator
+        conv_index: Conversation number per message (non-decreasing)
+
+    Returns:
+        Delay in seconds per creator message, in timeline order
+        (inf when no lead message follows in the same conversation)
+    """
+    creator_pos = np.flatnonzero(is_creator)
+    lead_pos = np.flatnonzero(is_lead)
+
+    delays = np.full(len(creator_pos), np.inf)
+    if not len(creator_pos) or not len(lead_pos):
+        return delays
+
+    next_slot = np.searchsorted(lead_pos, creator_pos, side='right')
+    has_next = next_slot < len(lead_pos)
+    next_lead = lead_pos[np.minimum(next_slot, len(lead_pos) - 1)]
+    has_next &= conv_index[next_lead] == conv_index[creator_pos]
+
+    delays[has_next] = timestamps[next_lead[has_next]] - timestamps[creator_pos[has_next]]
+    return delays
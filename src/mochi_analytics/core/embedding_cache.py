@@ -0,0 +1,72 @@
+"""Persistent embedding cache - SQLite store of vectors keyed by (model, text) hash."""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+import numpy as np
+
+# SQLite file for cached embeddings (unset or empty disables the cache; opt-in,
+# since the service keeps no state on its own disk)
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "")
+
+
+def embedding_cache_key(text: str, model: str) -> str:
+    """Stable key for an embedding (embeddings are deterministic per model and text)."""
+    return hashlib.sha256(f"{model}|{text}".encode()).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite-backed embedding store, safe to share across threads."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        """Look up cached embeddings; missing keys are absent from the result."""
+        found = {}
+        with self._lock:
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float64).tolist()
+        return found
+
+    def put_many(self, items: dict[str, list[float]]) -> None:
+        """Store embeddings (float64, so cached values round-trip exactly)."""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [
+                    (key, np.asarray(vector, dtype=np.float64).tobytes())
+                    for key, vector in items.items()
+                ]
+            )
+            self._conn.commit()
+
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Get the process-wide embedding cache, or None if disabled."""
+    global _cache
+    if not EMBEDDING_CACHE_PATH:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = EmbeddingCache(EMBEDDING_CACHE_PATH)
+        return _cache
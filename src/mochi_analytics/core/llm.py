@@ -2,11 +2,19 @@
 
 from google import genai
 from google.genai import types
-from typing import Any, Optional
-import json
+from typing import Any, Callable, Optional, TypeVar
+import logging
 import time
 import os
 
+import orjson
+
+from mochi_analytics.core.embedding_cache import embedding_cache_key, get_embedding_cache
+from mochi_analytics.core.llm_cache import get_llm_cache
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 # Global client instance
 _client: Optional[genai.Client] = None
@@ -25,6 +33,54 @@ def _get_client() -> genai.Client:
     return _client
 
 
+def generate_embeddings(
+    texts: list[str],
+    model: str = "models/text-embedding-004",
+    batch_size: int = 100
+) -> list[list[float]]:
+    """
+    Generate embeddings for many texts, batch_size texts per API request.
+
+    Embeddings already in the persistent cache (see embedding_cache) are
+    reused; only uncached texts are sent to the API.
+
+    Args:
+        texts: Texts to embed
+        model: Embedding model to use
+        batch_size: Texts per embed_content call (the API accepts up to 100)
+
+    Returns:
+        List of float embeddings, in the same order as texts
+    """
+    cache = get_embedding_cache()
+    keys = [embedding_cache_key(text, model) for text in texts]
+    cached = cache.get_many(keys) if cache else {}
+
+    # Unique uncached texts, in first-seen order
+    uncached = {}
+    for key, text in zip(keys, texts):
+        if key not in cached and key not in uncached:
+            uncached[key] = text
+
+    if uncached:
+        client = _get_client()
+        uncached_keys = list(uncached)
+        uncached_texts = list(uncached.values())
+        fetched = {}
+        for start in range(0, len(uncached_texts), batch_size):
+            result = client.models.embed_content(
+                model=model,
+                contents=uncached_texts[start:start + batch_size]
+            )
+            for key, embedding in zip(uncached_keys[start:start + batch_size], result.embeddings):
+                fetched[key] = embedding.values
+        if cache:
+            cache.put_many(fetched)
+        cached.update(fetched)
+
+    return [cached[key] for key in keys]
+
+
 def generate_embedding(text: str, model: str = "models/text-embedding-004") -> list[float]:
     """
     Generate embedding for text.
@@ -36,12 +92,24 @@ def generate_embedding(text: str, model: str = "models/text-embedding-004") -> l
     Returns:
         List of float embeddings
     """
-    client = _get_client()
-    result = client.models.embed_content(
-        model=model,
-        contents=text
-    )
-    return result.embeddings[0].values
+    return generate_embeddings([text], model=model)[0]
+
+
+def _retry(fn: Callable[[], T], max_retries: int, label: str) -> T:
+    """
+    Call fn, retrying failures with exponential backoff.
+
+    No backoff follows the final attempt; its error is raised immediately
+    as Exception(f"{label} after {max_retries} attempts: ...").
+    """
+    for attempt in range(max_retries):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == max_retries - 1:
+                raise Exception(f"{label} after {max_retries} attempts: {e}")
+            # Exponential backoff
+            time.sleep(2 ** attempt)
 
 
 def generate_text(
@@ -67,21 +135,17 @@ def generate_text(
     """
     client = _get_client()
 
-    for attempt in range(max_retries):
-        try:
-            response = client.models.generate_content(
-                model=model,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    temperature=temperature
-                )
+    def attempt() -> str:
+        response = client.models.generate_content(
+            model=model,
+            contents=prompt,
+            config=types.GenerateContentConfig(
+                temperature=temperature
             )
-            return response.text
-        except Exception as e:
-            if attempt == max_retries - 1:
-                raise Exception(f"Failed after {max_retries} attempts: {e}")
-            # Exponential backoff
-            time.sleep(2 ** attempt)
+        )
+        return response.text
+
+    return _retry(attempt, max_retries, "Failed")
 
 
 def generate_batch_classification(
@@ -104,14 +168,11 @@ def generate_batch_classification(
     """
     prompt = build_classification_prompt(messages, categories)
 
-    for attempt in range(max_retries):
-        try:
-            response = generate_text(prompt, model, temperature=0.3)
-            return parse_json_response(response)
-        except Exception as e:
-            if attempt == max_retries - 1:
-                raise Exception(f"Classification failed after {max_retries} attempts: {e}")
-            time.sleep(2 ** attempt)
+    def attempt() -> list[dict]:
+        response = generate_text(prompt, model, temperature=0.3, max_retries=1)
+        return parse_json_response(response)
+
+    return _retry(attempt, max_retries, "Classification failed")
 
 
 def build_classification_prompt(messages: list[str], categories: list[str]) -> str:
@@ -161,6 +222,12 @@ def parse_json_response(response: str) -> list[dict]:
     Returns:
         Parsed JSON data
     """
+    # Fast path: the response is already bare JSON
+    try:
+        return orjson.loads(response)
+    except orjson.JSONDecodeError:
+        pass
+
     # Remove markdown code blocks
     if "```json" in response:
         response = response.split("```json")[1].split("```")[0]
@@ -171,8 +238,8 @@ def parse_json_response(response: str) -> list[dict]:
     response = response.strip()
 
     try:
-        return json.loads(response)
-    except json.JSONDecodeError as e:
+        return orjson.loads(response)
+    except orjson.JSONDecodeError as e:
         raise Exception(f"Failed to parse JSON response: {e}\nResponse: {response}")
 
 
@@ -180,35 +247,59 @@ def generate_structured_output(
     prompt: str,
     expected_fields: list[str],
     model: str = "models/gemini-2.0-flash",
-    max_retries: int = 3
+    max_retries: int = 3,
+    cache_scope: Optional[str] = None,
+    cache_text: Optional[str] = None
 ) -> dict:
     """
     Generate structured JSON output with expected fields.
 
+    With a cache_scope (and the LLM cache enabled, see llm_cache), a call
+    whose cache_text is a near-exact match of an earlier one in the same
+    scope reuses that response instead of calling Gemini.
+
     Args:
         prompt: The prompt (should instruct to return JSON)
         expected_fields: List of expected field names
         model: Model to use
         max_retries: Maximum retry attempts
+        cache_scope: Who may share cached responses (e.g. the organization);
+            None disables the cache for this call
+        cache_text: The variable part of the prompt to match on
+            (defaults to the whole prompt)
 
     Returns:
         Parsed JSON dict
     """
-    for attempt in range(max_retries):
+    # Semantic cache: reuse the response of a near-identical earlier call
+    cache = get_llm_cache() if cache_scope is not None else None
+    scope = f"{model}|{','.join(expected_fields)}|{cache_scope}"
+    embedding = None
+    if cache:
         try:
-            response = generate_text(prompt, model, temperature=0.3)
-            data = parse_json_response(response)
-
-            # Validate expected fields
-            if not isinstance(data, dict):
-                raise ValueError(f"Expected dict, got {type(data)}")
-
-            missing_fields = [f for f in expected_fields if f not in data]
-            if missing_fields:
-                raise ValueError(f"Missing fields: {missing_fields}")
-
-            return data
+            embedding = generate_embedding(prompt if cache_text is None else cache_text)
         except Exception as e:
-            if attempt == max_retries - 1:
-                raise Exception(f"Structured output failed after {max_retries} attempts: {e}")
-            time.sleep(2 ** attempt)
+            logger.warning(f"Prompt embedding failed, skipping LLM cache: {e}")
+        else:
+            cached = cache.get(scope, embedding)
+            if cached is not None:
+                return cached
+
+    def attempt() -> dict:
+        response = generate_text(prompt, model, temperature=0.3, max_retries=1)
+        data = parse_json_response(response)
+
+        # Validate expected fields
+        if not isinstance(data, dict):
+            raise ValueError(f"Expected dict, got {type(data)}")
+
+        missing_fields = [f for f in expected_fields if f not in data]
+        if missing_fields:
+            raise ValueError(f"Missing fields: {missing_fields}")
+
+        return data
+
+    data = _retry(attempt, max_retries, "Structured output failed")
+    if embedding is not None:
+        cache.put(scope, embedding, data)
+    return data
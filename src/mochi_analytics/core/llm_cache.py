@@ -0,0 +1,107 @@
+"""Semantic LLM-response cache - SQLite store of structured outputs keyed by text embedding."""
+
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+import numpy as np
+import orjson
+
+# SQLite file for cached responses (unset or empty disables the cache)
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "")
+
+# Minimum cosine similarity between embeddings to reuse a response; only
+# near-exact matches, since a miss costs a call and a false hit a wrong answer
+LLM_CACHE_SIMILARITY = float(os.getenv("LLM_CACHE_SIMILARITY", "0.99"))
+
+
+class SemanticCache:
+    """
+    SQLite-backed response store looked up by nearest prompt embedding.
+
+    Entries are grouped by scope (model, expected output fields and the
+    caller's cache scope, e.g. the organization); lookups never cross
+    scopes. Within a scope the cached texts are searched by brute-force cosine similarity
+    over an in-memory matrix, which is loaded from disk on first use.
+    Safe to share across threads.
+    """
+
+    def __init__(self, path: str, threshold: float):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "scope TEXT NOT NULL, embedding BLOB NOT NULL, response BLOB NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_scope ON responses (scope)")
+        self._conn.commit()
+        # scope -> (unit-norm float32 embeddings matrix, serialized responses)
+        self._scopes: dict[str, tuple[np.ndarray, list[bytes]]] = {}
+
+    def _load(self, scope: str) -> tuple[np.ndarray, list[bytes]]:
+        """In-memory index for a scope (caller holds the lock)."""
+        entry = self._scopes.get(scope)
+        if entry is None:
+            rows = self._conn.execute(
+                "SELECT embedding, response FROM responses WHERE scope = ?", (scope,)
+            ).fetchall()
+            vectors = [np.frombuffer(blob, dtype=np.float32) for blob, _ in rows]
+            matrix = np.vstack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
+            entry = self._scopes[scope] = (matrix, [response for _, response in rows])
+        return entry
+
+    def get(self, scope: str, embedding: list[float]) -> Optional[dict]:
+        """Cached response for the most similar text, or None below the threshold."""
+        query = _unit(embedding)
+        with self._lock:
+            matrix, responses = self._load(scope)
+            if not len(responses) or matrix.shape[1] != len(query):
+                return None
+            similarities = matrix @ query
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+            response = responses[best]
+        return orjson.loads(response)
+
+    def put(self, scope: str, embedding: list[float], response: dict) -> None:
+        """Store a response under its text embedding."""
+        vector = _unit(embedding)
+        blob = orjson.dumps(response)
+        with self._lock:
+            matrix, responses = self._load(scope)
+            if len(responses) and matrix.shape[1] != len(vector):
+                return
+            self._conn.execute(
+                "INSERT INTO responses (scope, embedding, response) VALUES (?, ?, ?)",
+                (scope, vector.tobytes(), blob)
+            )
+            self._conn.commit()
+            self._scopes[scope] = (
+                np.vstack([matrix, vector]) if len(responses) else vector[np.newaxis, :],
+                responses + [blob]
+            )
+
+
+def _unit(embedding: list[float]) -> np.ndarray:
+    """Embedding as a unit-norm float32 vector (cosine similarity becomes a dot product)."""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+_cache: Optional[SemanticCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[SemanticCache]:
+    """Get the process-wide LLM response cache, or None if disabled."""
+    global _cache
+    if not LLM_CACHE_PATH:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = SemanticCache(LLM_CACHE_PATH, LLM_CACHE_SIMILARITY)
+        return _cache
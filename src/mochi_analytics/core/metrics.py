@@ -1,84 +1,62 @@
 """Core metrics calculation."""
 
-from datetime import datetime, timedelta
-from typing import List, Tuple
+from typing import List, Optional
 from collections import Counter
 from mochi_analytics.core.models import Conversation, Summary, MediaBreakdown
 from mochi_analytics.core.constants import STAGE_TYPES, MEDIA_TYPES
-import statistics
+from mochi_analytics.core.batch import ConversationBatch
+from mochi_analytics.core.timestamps import parse_timestamp
+import numpy as np
 
+# A creator message counts as replied to if the next lead message arrives within this window
+REPLY_WINDOW_SECONDS = 48 * 3600
 
-def calculate_core_metrics(conversations: List[Conversation]) -> Summary:
+
+def calculate_core_metrics(
+    conversations: List[Conversation],
+    batch: Optional[ConversationBatch] = None
+) -> Summary:
     """
     Calculate core metrics from conversations.
 
+    Args:
+        conversations: Conversations to analyze
+        batch: Prebuilt ConversationBatch for these conversations (built if omitted)
+
     Returns:
         Summary with all core metrics calculated
     """
+    if batch is None:
+        batch = ConversationBatch.from_conversations(conversations)
+
     total_conversations = len(conversations)
 
     # Message counts
-    messages_received = 0
-    messages_sent = 0
-    messages_from_mochi = 0
-
-    # Reply tracking
-    creator_messages_with_reply = 0
-    total_creator_messages = 0
-    reply_delays = []
+    messages_received = int(np.count_nonzero(batch.is_lead))
+    messages_sent = int(np.count_nonzero(batch.is_creator))
+    messages_from_mochi = messages_sent
 
     # Stage changes - initialize all stages with 0
     stage_changes = {stage: 0 for stage in STAGE_TYPES}
+    stage_changes.update(Counter(filter(None, (conv.stage for conv in conversations))))
 
     # Media breakdown - initialize all media types with 0
-    media_count = 0
-    media_by_type = {media_type: 0 for media_type in MEDIA_TYPES}
-
-    for conv in conversations:
-        # Count stage
-        if conv.stage:
-            stage_changes[conv.stage] = stage_changes.get(conv.stage, 0) + 1
-
-        # Get actual messages (filter out status changes)
-        messages = conv.get_actual_messages()
-
-        # Process messages
-        for i, msg in enumerate(messages):
-            # Count by sender
-            if msg.sender == "LEAD":
-                messages_received += 1
-            elif msg.sender == "CREATOR":
-                messages_sent += 1
-                messages_from_mochi += 1
-                total_creator_messages += 1
-
-                # Check if this creator message got a reply within 48h
-                reply_found = False
-                msg_time = parse_timestamp(msg.timestamp)
-
-                # Look for next LEAD message
-                for future_msg in messages[i+1:]:
-                    if future_msg.sender == "LEAD":
-                        future_time = parse_timestamp(future_msg.timestamp)
-                        time_diff = (future_time - msg_time).total_seconds()
-
-                        if time_diff <= 48 * 3600:  # 48 hours in seconds
-                            reply_found = True
-                            reply_delays.append(time_diff)
-                        break
-
-                if reply_found:
-                    creator_messages_with_reply += 1
-
-            # Count media
-            if msg.media:
-                for media_item in msg.media:
-                    media_count += 1
-                    media_type = media_item.get('type', 'other')
-                    if media_type in MEDIA_TYPES:
-                        media_by_type[media_type] = media_by_type.get(media_type, 0) + 1
-                    else:
-                        media_by_type['other'] = media_by_type.get('other', 0) + 1
+    # (tallied with one Counter; unknown types are folded into 'other')
+    raw_media = Counter(
+        media_item.get('type', 'other')
+        for msg in batch.messages if msg.attachments
+        for media_item in msg.attachments
+    )
+    media_count = raw_media.total()
+    media_by_type = {media_type: raw_media.pop(media_type, 0) for media_type in MEDIA_TYPES}
+    media_by_type['other'] += raw_media.total()
+
+    # Reply tracking: delay from each creator message to the next lead message
+    creator_delays = batch.creator_reply_delays
+    replied = creator_delays <= REPLY_WINDOW_SECONDS
+    reply_delays = creator_delays[replied]
+    total_creator_messages = len(creator_delays)
+    creator_messages_with_reply = int(np.count_nonzero(replied))
 
     # Calculate reply rate
     reply_rate = (
@@ -87,7 +65,7 @@ def calculate_core_metrics(conversations: List[Conversation]) -> Summary:
     )
 
     # Calculate median reply delay
-    median_delay = int(statistics.median(reply_delays)) if reply_delays else 0
+    median_delay = median_seconds(reply_delays)
 
     # Build media breakdown
     media_breakdown = MediaBreakdown(
@@ -108,29 +86,28 @@ def calculate_core_metrics(conversations: List[Conversation]) -> Summary:
     )
 
 
-def parse_timestamp(timestamp_str: str) -> datetime:
+def median_seconds(delays) -> int:
     """
-    Parse ISO format timestamp to datetime.
+    Median of reply delays in whole seconds (0 when there are none).
 
-    Handles multiple formats:
-    - 2025-01-15T10:30:00Z
-    - 2025-01-15T10:30:00+00:00
-    - 2025-01-15T10:30:00
+    Uses an in-place partition (quickselect, O(n)) instead of sorting all
+    samples. For an even count the two middle values are averaged, as
+    statistics.median does.
     """
-    # Remove 'Z' if present and replace with +00:00
-    if timestamp_str.endswith('Z'):
-        timestamp_str = timestamp_str[:-1] + '+00:00'
-
-    try:
-        # Try parsing with timezone
-        return datetime.fromisoformat(timestamp_str)
-    except ValueError:
-        # Fallback: parse without timezone and assume UTC
-        try:
-            return datetime.fromisoformat(timestamp_str)
-        except ValueError:
-            # Last resort: parse date only
-            return datetime.fromisoformat(timestamp_str.split('T')[0])
+    # One owned float64 copy (list inputs are converted, arrays are not mutated),
+    # then partitioned in place
+    values = np.array(delays, dtype=np.float64)
+    n = values.size
+    if n == 0:
+        return 0
+
+    mid = n // 2
+    if n % 2:
+        values.partition(mid)
+        return int(values[mid])
+
+    values.partition((mid - 1, mid))
+    return int((values[mid - 1] + values[mid]) / 2)
 
 
 def calculate_time_difference_seconds(start: str, end: str) -> float:
@@ -1,10 +1,27 @@
 """Pydantic models for Mochi Analytics."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter, ValidationError
+from dataclasses import dataclass
 from datetime import date
+from types import MappingProxyType
 from typing import Optional
 
 
+# Mochi stage names -> standard stage names
+STAGE_MAPPING = MappingProxyType({
+    "NEW": "NEW_LEAD",
+    "QUALIFIED": "QUALIFIED",
+    "BOOKED": "BOOKED_CALL",
+    "BOOKED_CALL": "BOOKED_CALL",
+    "WON": "WON",
+    "LOST": "LOST",
+    "UNQUALIFIED": "UNQUALIFIED",
+    "IN_CONTACT": "IN_CONTACT",
+    "DEPOSIT": "DEPOSIT",
+    "NO_SHOW": "NO_SHOW"
+})
+
+
 # ===== Input Models =====
 
 class AnalysisConfig(BaseModel):
@@ -20,8 +37,15 @@ class AnalysisConfig(BaseModel):
     max_concurrent_api_calls: int = 5
 
 
-class Message(BaseModel):
-    """Single message in conversation."""
+@dataclass(slots=True, frozen=True)
+class Message:
+    """
+    Single message in conversation.
+
+    Only built internally from Conversation.messages (validated through
+    MESSAGE_LIST_ADAPTER), so it is a slotted dataclass rather than a
+    BaseModel: no per-instance __dict__, and far less memory per message.
+    """
     sender: str  # "LEAD" or "CREATOR"
     content: str
     created_at: str  # ISO format timestamp
@@ -61,6 +85,9 @@ class Conversation(BaseModel):
     closer_email: Optional[str] = None
     closer_name: Optional[str] = None
 
+    # Memoized get_actual_messages() result
+    _actual_messages: Optional[list[Message]] = PrivateAttr(default=None)
+
     # Computed fields for backwards compatibility
     @property
     def id(self) -> str:
@@ -75,19 +102,7 @@ class Conversation(BaseModel):
     @property
     def stage(self) -> str:
         """Map current_stage to standard stage names."""
-        stage_mapping = {
-            "NEW": "NEW_LEAD",
-            "QUALIFIED": "QUALIFIED",
-            "BOOKED": "BOOKED_CALL",
-            "BOOKED_CALL": "BOOKED_CALL",
-            "WON": "WON",
-            "LOST": "LOST",
-            "UNQUALIFIED": "UNQUALIFIED",
-            "IN_CONTACT": "IN_CONTACT",
-            "DEPOSIT": "DEPOSIT",
-            "NO_SHOW": "NO_SHOW"
-        }
-        return stage_mapping.get(self.current_stage, self.current_stage)
+        return STAGE_MAPPING.get(self.current_stage, self.current_stage)
 
     @property
     def created_at(self) -> str:
@@ -98,17 +113,40 @@ class Conversation(BaseModel):
         return ""
 
     def get_actual_messages(self) -> list[Message]:
-        """Filter out status changes and return only actual messages."""
-        actual = []
-        for msg in self.messages:
-            if isinstance(msg, dict) and "sender" in msg and "content" in msg:
+        """
+        Filter out status changes and return only actual messages.
+
+        Parsed once per conversation and memoized; analyses only read the
+        result, so callers must not mutate the returned list.
+        """
+        if self._actual_messages is not None:
+            return self._actual_messages
+
+        candidates = [
+            msg for msg in self.messages
+            if isinstance(msg, dict) and "sender" in msg and "content" in msg
+        ]
+        try:
+            # One pydantic-core call for the whole list
+            actual = MESSAGE_LIST_ADAPTER.validate_python(candidates)
+        except ValidationError:
+            # Some entry is malformed: validate one by one, skipping bad entries
+            actual = []
+            for msg in candidates:
                 try:
-                    actual.append(Message(**msg))
+                    actual.append(MESSAGE_ADAPTER.validate_python(msg))
                 except Exception:
                     continue
+        self._actual_messages = actual
         return actual
 
 
+# Reusable validators for bulk payloads (build the core schema once)
+MESSAGE_ADAPTER = TypeAdapter(Message)
+MESSAGE_LIST_ADAPTER = TypeAdapter(list[Message])
+CONVERSATION_LIST_ADAPTER = TypeAdapter(list[Conversation])
+
+
 # ===== Output Models =====
 
 class MediaBreakdown(BaseModel):
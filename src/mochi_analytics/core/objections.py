@@ -1,6 +1,9 @@
 """Objection classification - analyze LEAD objections using Gemini."""
 
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 from typing import List, Dict
+import numpy as np
 from mochi_analytics.core.models import Conversation, ObjectionGroup
 from mochi_analytics.core.llm import generate_batch_classification, generate_text, parse_json_response
 from mochi_analytics.core.constants import OBJECTION_GROUPS
@@ -8,8 +11,42 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Position of each category in OBJECTION_GROUPS
+OBJECTION_GROUP_IDS = MappingProxyType({category: i for i, category in enumerate(OBJECTION_GROUPS)})
+
+# Human-readable description per objection category
+OBJECTION_DESCRIPTIONS = MappingProxyType({
+    "Financial Objection": "Concerns about price, budget, or cost",
+    "Timing Objection": "Not the right time, too busy, need more time",
+    "Decision Making Objection": "Need to consult with others, can't decide alone",
+    "Self Confidence Objection": "Doubts about ability to succeed or commit",
+    "Lack of Trust/Authority Objection": "Skepticism about credibility or expertise",
+    "Competitor Objection": "Considering alternatives or competitors",
+    "Lack of Information Objection": "Need more details or clarity before deciding"
+})
+
+# Fixed parts of the classify_batch prompt, built once; only the numbered
+# message list between them changes per batch
+CLASSIFY_PROMPT_PREFIX = (
+    'Classify each message into ONE objection category or "none" if no objection.\n\n'
+    "Categories:\n"
+    + "\n".join(f"- {cat}" for cat in OBJECTION_GROUPS)
+    + "\n- none (not an objection)\n\nMessages:\n"
+)
+
+CLASSIFY_PROMPT_SUFFIX = """
 
-def analyze_objections(conversations: List[Conversation]) -> Dict:
+Return a JSON array:
+[
+  {"message_index": 1, "category": "category_name"},
+  {"message_index": 2, "category": "none"},
+  ...
+]
+
+Return ONLY the JSON array."""
+
+
+def analyze_objections(conversations: List[Conversation], max_concurrent_api_calls: int = 5) -> Dict:
     """
     Analyze LEAD messages for objections.
 
@@ -17,6 +54,7 @@ def analyze_objections(conversations: List[Conversation]) -> Dict:
 
     Args:
         conversations: List of conversations
+        max_concurrent_api_calls: Maximum batches classified at once
 
     Returns:
         Dict with objection_groups and total_analyzed
@@ -30,7 +68,7 @@ def analyze_objections(conversations: List[Conversation]) -> Dict:
     logger.info(f"Extracted {len(lead_messages)} LEAD messages")
 
     # Classify with adaptive batch retry
-    classifications = classify_with_adaptive_retry(lead_messages)
+    classifications = classify_with_adaptive_retry(lead_messages, max_workers=max_concurrent_api_calls)
 
     logger.info(f"Classified {len(classifications)} messages")
 
@@ -53,48 +91,73 @@ def extract_lead_messages(conversations: List[Conversation]) -> List[str]:
     Returns:
         List of message content strings
     """
-    messages = []
-
-    for conv in conversations:
-        actual_messages = conv.get_actual_messages()
-
-        for msg in actual_messages:
-            if msg.sender == "LEAD":
-                content = msg.content.strip()
-                if content:  # Skip empty messages
-                    messages.append(content)
-
-    return messages
+    # get_actual_messages is memoized, so this reuses messages already parsed
+    # by earlier passes; empty messages are skipped
+    return [
+        content
+        for conv in conversations
+        for msg in conv.get_actual_messages()
+        if msg.sender == "LEAD" and (content := msg.content.strip())
+    ]
 
 
 def classify_with_adaptive_retry(
     messages: List[str],
-    batch_sizes: List[int] = [50, 25, 8, 1]
+    batch_sizes: List[int] = [50, 25, 8, 1],
+    max_workers: int = 5
 ) -> List[Dict]:
     """
     Classify messages with adaptive batch retry.
 
-    Starts with batch_size=50, falls back to 25, 8, then 1 on failure.
+    Messages are split into batches of the largest size, which are classified
+    concurrently (each is an independent Gemini request). A failing batch
+    falls back to 25, 8, then 1 on its own, without slowing the others.
 
     Args:
         messages: List of message strings
         batch_sizes: List of batch sizes to try (default: [50, 25, 8, 1])
+        max_workers: Maximum batches classified at once
+
+    Returns:
+        List of classification dicts, in message order
+    """
+    batch_size = batch_sizes[0] if batch_sizes else 1
+    batches = [messages[i:i + batch_size] for i in range(0, len(messages), batch_size)]
+    if not batches:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as executor:
+        batch_results = list(executor.map(
+            classify_batch_with_fallback, batches, [batch_sizes] * len(batches)
+        ))
+
+    return [result for results in batch_results for result in results]
+
+
+def classify_batch_with_fallback(messages: List[str], batch_sizes: List[int]) -> List[Dict]:
+    """
+    Classify messages sequentially, stepping down the batch size on failure.
+
+    Args:
+        messages: List of message strings
+        batch_sizes: Batch sizes to try, largest first
 
     Returns:
         List of classification dicts
     """
     all_results = []
-    remaining_messages = messages[:]
+    # Position of the first unclassified message (no re-slicing of the tail)
+    start = 0
 
-    while remaining_messages:
+    while start < len(messages):
         batch_size = batch_sizes[0] if batch_sizes else 1
-        batch = remaining_messages[:batch_size]
+        batch = messages[start:start + batch_size]
 
         try:
             # Try to classify this batch
             results = classify_batch(batch)
             all_results.extend(results)
-            remaining_messages = remaining_messages[batch_size:]
+            start += batch_size
 
             logger.info(f"✓ Classified batch of {len(batch)} (batch_size={batch_size})")
 
@@ -109,7 +172,7 @@ def classify_with_adaptive_retry(
                 # Even single message failed - mark as unclassified
                 logger.error(f"Failed to classify even single message, skipping")
                 all_results.append({"category": "unclassified"})
-                remaining_messages = remaining_messages[1:]
+                start += 1
 
     return all_results
 
@@ -127,26 +190,8 @@ def classify_batch(messages: List[str]) -> List[Dict]:
     Raises:
         Exception: If classification fails
     """
-    categories_str = "\n".join([f"- {cat}" for cat in OBJECTION_GROUPS])
     messages_str = "\n".join([f"{i+1}. {msg[:200]}" for i, msg in enumerate(messages)])
-
-    prompt = f"""Classify each message into ONE objection category or "none" if no objection.
-
-Categories:
-{categories_str}
-- none (not an objection)
-
-Messages:
-{messages_str}
-
-Return a JSON array:
-[
-  {{"message_index": 1, "category": "category_name"}},
-  {{"message_index": 2, "category": "none"}},
-  ...
-]
-
-Return ONLY the JSON array."""
+    prompt = CLASSIFY_PROMPT_PREFIX + messages_str + CLASSIFY_PROMPT_SUFFIX
 
     response = generate_text(prompt, temperature=0.3, max_retries=2)
     parsed = parse_json_response(response)
@@ -170,30 +215,27 @@ def aggregate_objections(classifications: List[Dict]) -> List[ObjectionGroup]:
     Returns:
         List of ObjectionGroup models
     """
-    # Count by category
-    counts = {}
-    for item in classifications:
-        category = item.get("category", "unclassified")
-        if category != "none":  # Skip non-objections
-            counts[category] = counts.get(category, 0) + 1
-
-    total = sum(counts.values())
+    # Count per objection group by index; "none" is not an objection, while
+    # unclassified/unknown categories still count toward the total
+    categories = [item.get("category", "unclassified") for item in classifications]
+    total = len(categories) - categories.count("none")
+    group_ids = np.fromiter(
+        (OBJECTION_GROUP_IDS.get(category, -1) for category in categories),
+        dtype=np.intp,
+        count=len(categories)
+    )
+    counts = np.bincount(group_ids[group_ids >= 0], minlength=len(OBJECTION_GROUPS)).tolist()
 
     # Build ObjectionGroup list
-    groups = []
-    for category in OBJECTION_GROUPS:
-        count = counts.get(category, 0)
-        percentage = (count / total * 100) if total > 0 else 0.0
-
-        # Get description for this category
-        description = get_objection_description(category)
-
-        groups.append(ObjectionGroup(
+    groups = [
+        ObjectionGroup(
             name=category,
-            description=description,
+            description=OBJECTION_DESCRIPTIONS[category],
             count=count,
-            percentage=round(percentage, 1)
-        ))
+            percentage=round((count / total * 100) if total > 0 else 0.0, 1)
+        )
+        for category, count in zip(OBJECTION_GROUPS, counts)
+    ]
 
     # Sort by count descending
     groups.sort(key=lambda x: x.count, reverse=True)
@@ -211,16 +253,7 @@ def get_objection_description(category: str) -> str:
     Returns:
         Human-readable description
     """
-    descriptions = {
-        "Financial Objection": "Concerns about price, budget, or cost",
-        "Timing Objection": "Not the right time, too busy, need more time",
-        "Decision Making Objection": "Need to consult with others, can't decide alone",
-        "Self Confidence Objection": "Doubts about ability to succeed or commit",
-        "Lack of Trust/Authority Objection": "Skepticism about credibility or expertise",
-        "Competitor Objection": "Considering alternatives or competitors",
-        "Lack of Information Objection": "Need more details or clarity before deciding"
-    }
-    return descriptions.get(category, "")
+    return OBJECTION_DESCRIPTIONS.get(category, "")
 
 
 def build_empty_objections_result() -> Dict:
@@ -229,7 +262,7 @@ def build_empty_objections_result() -> Dict:
         "objection_groups": [
             ObjectionGroup(
                 name=cat,
-                description=get_objection_description(cat),
+                description=OBJECTION_DESCRIPTIONS[cat],
                 count=0,
                 percentage=0.0
             )
@@ -2,14 +2,14 @@
 
 import logging
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
 from typing import Optional
 
-import pytz
-from rapidfuzz import fuzz
+import numpy as np
+from rapidfuzz import fuzz, process
 
-from mochi_analytics.core.metrics import parse_timestamp
+from mochi_analytics.core.timestamps import get_timezone, local_date_bounds, to_epoch_seconds
 from mochi_analytics.core.models import Conversation
 
 logger = logging.getLogger(__name__)
@@ -37,54 +37,67 @@ class ScriptSearchResult:
         }
 
 
-def find_similar_messages(
+@dataclass
+class ScriptSearchCorpus:
+    """
+    Candidate messages for script searches, extracted once and shared by every query.
+
+    Parallel lists with one entry per message that passed the sender and
+    date filters, so each query only has to score the prepared contents.
+    Identical contents (repeated openers, CTAs) are stored and scored once.
+    """
+
+    contents: list[str]  # Distinct lowercased, stripped message contents
+    content_ids: np.ndarray  # int; index into contents
+    content_lengths: np.ndarray  # int; length of each distinct content
+    setter_ids: np.ndarray  # int; index into setter_names
+    setter_names: list[str]  # Distinct setters, in order of first appearance
+    has_reply: np.ndarray  # bool; a LEAD message follows in the same conversation
+    conversation_ids: list[str]
+    previews: list[str]  # Original content, truncated to 100 chars
+    # search_corpus results by (query, threshold, match_type), so a query
+    # shared by several scripts or group members is only scored once
+    results: dict[tuple[str, float, str], dict] = field(default_factory=dict, repr=False)
+
+
+def build_script_search_corpus(
     conversations: list[Conversation],
-    query_message: str,
     timezone: str = "UTC",
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
-    similarity_threshold: float = 85.0,
-    sender_filter: str = "CREATOR",
-    match_type: str = "token_set"
-) -> dict:
+    sender_filter: str = "CREATOR"
+) -> ScriptSearchCorpus:
     """
-    Find messages similar to a query using fuzzy matching.
+    Extract the messages script searches run against.
 
     Args:
         conversations: List of conversations to search
-        query_message: The message pattern to search for
         timezone: IANA timezone for date filtering
         date_from: Start date filter (optional)
         date_to: End date filter (optional)
-        similarity_threshold: Minimum similarity score (0-100)
         sender_filter: Filter by sender type ("CREATOR" or "LEAD")
-        match_type: Fuzzy match type ("ratio", "token_set", "partial")
 
     Returns:
-        Dict with total_matches, total_replies, reply_rate, setters breakdown
+        ScriptSearchCorpus with one entry per candidate message
     """
-    tz = pytz.timezone(timezone)
-
-    # Select matching function based on match_type
-    if match_type == "ratio":
-        match_func = fuzz.ratio
-    elif match_type == "partial":
-        match_func = fuzz.partial_ratio
-    else:  # default: token_set
-        match_func = fuzz.token_set_ratio
-
-    total_matches = 0
-    total_replies = 0
-    setters_breakdown: dict[str, dict[str, int | float]] = defaultdict(
-        lambda: {"matches": 0, "replies": 0, "reply_rate": 0.0}
+    # Local-day filter as an epoch range, computed once
+    start, end = local_date_bounds(get_timezone(timezone), date_from, date_to)
+    corpus = ScriptSearchCorpus(
+        contents=[], content_ids=[], content_lengths=[], setter_ids=[], setter_names=[],
+        has_reply=[], conversation_ids=[], previews=[]
     )
-    all_matches = []
-
-    query_normalized = query_message.lower().strip()
+    content_index: dict[str, int] = {}
+    setter_index: dict[str, int] = {}
 
     for conv in conversations:
         messages = conv.get_actual_messages()
 
+        # A message has a reply iff some LEAD message comes after it, i.e. it
+        # precedes the conversation's last LEAD message (found once, scanning back)
+        last_lead = next(
+            (j for j in range(len(messages) - 1, -1, -1) if messages[j].sender == "LEAD"), -1
+        )
+
         for i, msg in enumerate(messages):
             # Filter by sender
             if msg.sender != sender_filter:
@@ -93,94 +106,333 @@ def find_similar_messages(
             # Date filtering
             if date_from or date_to:
                 try:
-                    msg_time = parse_timestamp(msg.timestamp)
-                    msg_date = msg_time.astimezone(tz).date()
-
-                    if date_from and msg_date < date_from:
-                        continue
-                    if date_to and msg_date > date_to:
-                        continue
+                    epoch = to_epoch_seconds(msg.timestamp)
                 except Exception:
                     continue
+                if not start <= epoch < end:
+                    continue
+
+            has_reply = i < last_lead
+
+            content = msg.content.lower().strip()
+            content_id = content_index.get(content)
+            if content_id is None:
+                content_id = content_index[content] = len(corpus.contents)
+                corpus.contents.append(content)
+            corpus.content_ids.append(content_id)
+
+            # Track setter (use sent_by if available, else setter_email from conversation)
+            setter = msg.sent_by or conv.setter_email or "Unknown"
+            setter_id = setter_index.get(setter)
+            if setter_id is None:
+                setter_id = setter_index[setter] = len(corpus.setter_names)
+                corpus.setter_names.append(setter)
+            corpus.setter_ids.append(setter_id)
+            corpus.has_reply.append(has_reply)
+            corpus.conversation_ids.append(conv.id)
+            corpus.previews.append(msg.content[:100])
+
+    # Packed so each search can gather and count its matches' fields in one call
+    corpus.content_ids = np.asarray(corpus.content_ids, dtype=np.intp)
+    corpus.content_lengths = np.fromiter(
+        (len(content) for content in corpus.contents), dtype=np.int64, count=len(corpus.contents)
+    )
+    corpus.setter_ids = np.asarray(corpus.setter_ids, dtype=np.intp)
+    corpus.has_reply = np.asarray(corpus.has_reply, dtype=bool)
+    return corpus
+
+
+def search_corpus(
+    corpus: ScriptSearchCorpus,
+    query_message: str,
+    similarity_threshold: float = 85.0,
+    match_type: str = "token_set",
+    return_matches: bool = False
+) -> dict:
+    """
+    Find corpus messages similar to a query using fuzzy matching.
+
+    Args:
+        corpus: Prepared candidate messages
+        query_message: The message pattern to search for
+        similarity_threshold: Minimum similarity score (0-100)
+        match_type: Fuzzy match type ("ratio", "token_set", "partial")
+        return_matches: Also list every matching message (all_matches)
+
+    Returns:
+        Dict with total_matches, total_replies, reply_rate, setters breakdown
+        (plus all_matches if requested). Results without matches are cached
+        on the corpus; treat them as read-only.
+    """
+    query_normalized = query_message.lower().strip()
+    cache_key = (query_normalized, similarity_threshold, match_type)
+    if not return_matches:
+        cached = corpus.results.get(cache_key)
+        if cached is not None:
+            return cached
+
+    # Score the query against the distinct contents, then expand to one
+    # score per message
+    similarities = score_contents(
+        corpus, [query_normalized], match_type, similarity_threshold
+    )[0][corpus.content_ids]
+
+    result = summarize_matches(corpus, similarities, similarity_threshold, return_matches)
+    if not return_matches:
+        corpus.results[cache_key] = result
+    return result
+
+
+def search_corpus_many(corpus: ScriptSearchCorpus, script_configs: list) -> None:
+    """
+    Score many script configs against a corpus up front.
+
+    Uncached queries are grouped by match type and each group is scored in
+    a single multithreaded cdist call (one row per query), filling the
+    corpus result cache so the per-config search_corpus calls that follow
+    are lookups.
 
-            # Fuzzy match
-            content_normalized = msg.content.lower().strip()
-            similarity = match_func(query_normalized, content_normalized)
+    Args:
+        corpus: Prepared candidate messages
+        script_configs: Objects with query, threshold and match_type
+    """
+    pending: dict[str, dict[tuple[str, float, str], None]] = defaultdict(dict)
+    for config in script_configs:
+        cache_key = (config.query.lower().strip(), config.threshold, config.match_type)
+        if cache_key not in corpus.results:
+            pending[config.match_type][cache_key] = None
+
+    for match_type, cache_keys in pending.items():
+        cache_keys = list(cache_keys)
+        scores = score_contents(
+            corpus,
+            [query for query, _, _ in cache_keys],
+            match_type,
+            min(threshold for _, threshold, _ in cache_keys)
+        )
+        for cache_key, similarities in zip(cache_keys, scores):
+            corpus.results[cache_key] = summarize_matches(
+                corpus, similarities[corpus.content_ids], cache_key[1]
+            )
 
-            if similarity >= similarity_threshold:
-                total_matches += 1
 
-                # Track setter (use sent_by if available, else setter_email from conversation)
-                setter = msg.sent_by or conv.setter_email or "Unknown"
-                setters_breakdown[setter]["matches"] += 1
+def score_contents(
+    corpus: ScriptSearchCorpus,
+    queries: list[str],
+    match_type: str,
+    score_cutoff: float
+) -> np.ndarray:
+    """
+    Similarity of each query to each distinct corpus content.
 
-                # Check for reply (next LEAD message)
-                has_reply = False
-                for future_msg in messages[i + 1:]:
-                    if future_msg.sender == "LEAD":
-                        has_reply = True
-                        break
+    One multithreaded cdist call; scores below score_cutoff are 0. For
+    "ratio", contents whose length alone rules out reaching the cutoff for
+    every query are skipped without scoring: ratio(a, b) can be at most
+    200 * min(len a, len b) / (len a + len b).
 
-                if has_reply:
-                    total_replies += 1
-                    setters_breakdown[setter]["replies"] += 1
+    Returns:
+        float64 array of shape (len(queries), len(corpus.contents))
+    """
+    contents = corpus.contents
+    candidates = None
+    if match_type == "ratio":
+        query_lengths = np.array([len(query) for query in queries])[:, None]
+        lengths = corpus.content_lengths[None, :]
+        # (small slack so float rounding never drops a content at the bound)
+        feasible = (
+            200 * np.minimum(lengths, query_lengths) + 1e-6
+            >= score_cutoff * (lengths + query_lengths)
+        )
+        candidates = np.flatnonzero(feasible.any(axis=0))
+        contents = [contents[i] for i in candidates.tolist()]
+
+    scores = process.cdist(
+        queries,
+        contents,
+        scorer=get_match_func(match_type),
+        score_cutoff=score_cutoff,
+        dtype=np.float64,
+        workers=-1
+    )
+    if candidates is None:
+        return scores
 
-                all_matches.append({
-                    "conversation_id": conv.id,
-                    "message_content": msg.content[:100],
-                    "similarity": similarity,
-                    "has_reply": has_reply,
-                    "setter": setter
-                })
+    all_scores = np.zeros((len(queries), len(corpus.contents)))
+    all_scores[:, candidates] = scores
+    return all_scores
+
+
+def get_match_func(match_type: str):
+    """rapidfuzz scorer for a match type ("ratio", "partial", default token_set)."""
+    if match_type == "ratio":
+        return fuzz.ratio
+    elif match_type == "partial":
+        return fuzz.partial_ratio
+    else:  # default: token_set
+        return fuzz.token_set_ratio
+
+
+def summarize_matches(
+    corpus: ScriptSearchCorpus,
+    similarities: np.ndarray,
+    similarity_threshold: float,
+    return_matches: bool = False
+) -> dict:
+    """
+    Aggregate one query's per-message similarity scores into a search result.
+
+    Args:
+        corpus: Prepared candidate messages
+        similarities: Score per corpus message (float64)
+        similarity_threshold: Minimum similarity score (0-100)
+        return_matches: Also list every matching message (all_matches)
+
+    Returns:
+        Dict with total_matches, total_replies, reply_rate, setters breakdown
+        (plus all_matches if requested)
+    """
+    matched = np.flatnonzero(similarities >= similarity_threshold)
+    matched_replies = corpus.has_reply[matched]
+    total_matches = len(matched)
+    total_replies = int(np.count_nonzero(matched_replies))
+
+    # Per-setter counts by setter id; setters are listed in order of first match
+    matched_setters = corpus.setter_ids[matched]
+    n_setters = len(corpus.setter_names)
+    setter_matches = np.bincount(matched_setters, minlength=n_setters).tolist()
+    setter_replies = np.bincount(matched_setters[matched_replies], minlength=n_setters).tolist()
+    _, first_match = np.unique(matched_setters, return_index=True)
+
+    setters_breakdown: dict[str, dict[str, int | float]] = {}
+    for setter_id in matched_setters[np.sort(first_match)].tolist():
+        matches = setter_matches[setter_id]
+        replies = setter_replies[setter_id]
+        setters_breakdown[corpus.setter_names[setter_id]] = {
+            "matches": matches,
+            "replies": replies,
+            "reply_rate": (replies / matches * 100) if matches > 0 else 0.0
+        }
 
     # Calculate reply rate
     reply_rate = (total_replies / total_matches * 100) if total_matches > 0 else 0.0
 
-    # Add reply_rate to setters breakdown
-    for setter, data in setters_breakdown.items():
-        matches = data["matches"]
-        replies = data["replies"]
-        data["reply_rate"] = (replies / matches * 100) if matches > 0 else 0.0
-
-    return {
+    result = {
         "total_matches": total_matches,
         "total_replies": total_replies,
         "reply_rate": round(reply_rate, 1),
-        "setters_breakdown": dict(setters_breakdown),
-        "all_matches": all_matches
+        "setters_breakdown": setters_breakdown
     }
+    if not return_matches:
+        return result
+
+    result["all_matches"] = [
+        {
+            "conversation_id": corpus.conversation_ids[i],
+            "message_content": corpus.previews[i],
+            "similarity": similarity,
+            "has_reply": has_reply,
+            "setter": corpus.setter_names[setter_id]
+        }
+        for i, similarity, has_reply, setter_id in zip(
+            matched.tolist(),
+            similarities[matched].tolist(),
+            matched_replies.tolist(),
+            matched_setters.tolist()
+        )
+    ]
+    return result
+
+
+def find_similar_messages(
+    conversations: list[Conversation],
+    query_message: str,
+    timezone: str = "UTC",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    similarity_threshold: float = 85.0,
+    sender_filter: str = "CREATOR",
+    match_type: str = "token_set",
+    return_matches: bool = False
+) -> dict:
+    """
+    Find messages similar to a query using fuzzy matching.
+
+    Args:
+        conversations: List of conversations to search
+        query_message: The message pattern to search for
+        timezone: IANA timezone for date filtering
+        date_from: Start date filter (optional)
+        date_to: End date filter (optional)
+        similarity_threshold: Minimum similarity score (0-100)
+        sender_filter: Filter by sender type ("CREATOR" or "LEAD")
+        match_type: Fuzzy match type ("ratio", "token_set", "partial")
+        return_matches: Also list every matching message (all_matches)
+
+    Returns:
+        Dict with total_matches, total_replies, reply_rate, setters breakdown
+        (plus all_matches if requested)
+    """
+    corpus = build_script_search_corpus(
+        conversations,
+        timezone=timezone,
+        date_from=date_from,
+        date_to=date_to,
+        sender_filter=sender_filter
+    )
+    return search_corpus(corpus, query_message, similarity_threshold, match_type, return_matches)
 
 
 def run_script_searches(
     conversations: list[Conversation],
     script_configs: list,  # List of ScriptAnalysisConfig objects
     timezone: str = "UTC",
-    target_date: Optional[date] = None
+    target_date: Optional[date] = None,
+    corpus: Optional[ScriptSearchCorpus] = None
 ) -> list[ScriptSearchResult]:
     """
     Run multiple script searches and return results.
 
+    Conversations are scanned once into a ScriptSearchCorpus that every
+    config is scored against. Pass a prebuilt corpus to share it across
+    several calls (e.g. script and grouped searches for the same day).
+
     Args:
         conversations: Conversations to search
         script_configs: List of ScriptAnalysisConfig objects
         timezone: IANA timezone
         target_date: Specific date to analyze (usually yesterday)
+        corpus: Prebuilt corpus for these conversations/timezone/date (optional)
 
     Returns:
         List of ScriptSearchResult objects
     """
     results = []
 
-    for config in script_configs:
+    if corpus is None and script_configs:
         try:
-            search_result = find_similar_messages(
-                conversations=conversations,
-                query_message=config.query,
+            corpus = build_script_search_corpus(
+                conversations,
                 timezone=timezone,
                 date_from=target_date,
                 date_to=target_date,
+                sender_filter="CREATOR"
+            )
+        except Exception as e:
+            logger.error(f"Script search failed to prepare messages: {e}")
+            return results
+
+    try:
+        search_corpus_many(corpus, script_configs)
+    except Exception as e:
+        # Fall back to scoring each config on its own below
+        logger.error(f"Batched script search scoring failed: {e}")
+
+    for config in script_configs:
+        try:
+            search_result = search_corpus(
+                corpus,
+                query_message=config.query,
                 similarity_threshold=config.threshold,
-                sender_filter="CREATOR",
                 match_type=config.match_type
             )
 
@@ -190,7 +442,11 @@ def run_script_searches(
                 total_matches=search_result["total_matches"],
                 total_replies=search_result["total_replies"],
                 reply_rate=search_result["reply_rate"],
-                setters_breakdown=search_result["setters_breakdown"]
+                # Copied: the search result may be shared with other configs
+                setters_breakdown={
+                    setter: dict(data)
+                    for setter, data in search_result["setters_breakdown"].items()
+                }
             ))
 
             logger.info(
@@ -203,3 +459,84 @@ def run_script_searches(
             logger.error(f"Script search failed for '{config.label}': {e}")
 
     return results
+
+
+def run_grouped_script_searches(
+    conversations: list[Conversation],
+    grouped_configs: list,  # List of GroupedAnalysisConfig objects
+    timezone: str = "UTC",
+    target_date: Optional[date] = None,
+    corpus: Optional[ScriptSearchCorpus] = None
+) -> list[ScriptSearchResult]:
+    """
+    Run each group's member searches and sum them into one result per group.
+
+    Args:
+        conversations: Conversations to search
+        grouped_configs: List of GroupedAnalysisConfig objects
+        timezone: IANA timezone
+        target_date: Specific date to analyze (usually yesterday)
+        corpus: Prebuilt corpus for these conversations/timezone/date (optional)
+
+    Returns:
+        List of ScriptSearchResult objects (query "[grouped]"), one per group
+    """
+    results = []
+
+    if corpus is None and grouped_configs:
+        corpus = build_script_search_corpus(
+            conversations,
+            timezone=timezone,
+            date_from=target_date,
+            date_to=target_date,
+            sender_filter="CREATOR"
+        )
+
+    # Score every member query in one batched pass; members shared between
+    # groups are scored once
+    try:
+        search_corpus_many(corpus, [m for group in grouped_configs for m in group.member_configs])
+    except Exception as e:
+        logger.error(f"Batched grouped search scoring failed: {e}")
+
+    for group in grouped_configs:
+        logger.info(f"Running grouped analysis '{group.label}' with {len(group.member_configs)} members")
+        member_results = run_script_searches(
+            conversations=conversations,
+            script_configs=group.member_configs,
+            timezone=timezone,
+            target_date=target_date,
+            corpus=corpus
+        )
+
+        # Sum the results
+        total_matches = sum(r.total_matches for r in member_results)
+        total_replies = sum(r.total_replies for r in member_results)
+        reply_rate = (total_replies / total_matches * 100) if total_matches > 0 else 0.0
+
+        # Merge setters_breakdown
+        merged_setters: dict[str, dict[str, int | float]] = {}
+        for r in member_results:
+            for setter, data in r.setters_breakdown.items():
+                if setter not in merged_setters:
+                    merged_setters[setter] = {"matches": 0, "replies": 0, "reply_rate": 0.0}
+                merged_setters[setter]["matches"] += data.get("matches", 0)
+                merged_setters[setter]["replies"] += data.get("replies", 0)
+
+        # Calculate reply_rate for each setter
+        for setter, data in merged_setters.items():
+            matches = data["matches"]
+            replies = data["replies"]
+            data["reply_rate"] = (replies / matches * 100) if matches > 0 else 0.0
+
+        results.append(ScriptSearchResult(
+            query="[grouped]",
+            label=group.label,
+            total_matches=total_matches,
+            total_replies=total_replies,
+            reply_rate=round(reply_rate, 1),
+            setters_breakdown=merged_setters
+        ))
+        logger.info(f"Grouped '{group.label}': {total_matches} total matches")
+
+    return results
@@ -1,5 +1,7 @@
 """Script analysis - clustering and categorization of CREATOR messages."""
 
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from collections import defaultdict
 from rapidfuzz import fuzz
@@ -10,11 +12,20 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+_ASCII_WHITESPACE = re.compile(r"[ \t\n\r\x0b\x0c]+")
+
+# Categorization batches: estimated prompt tokens and script count per request
+SCRIPT_BATCH_MAX_TOKENS = 6000
+SCRIPT_BATCH_MAX_SIZE = 40
+# Per-script prompt framing (script ID, headers, sender tags) in tokens
+SCRIPT_PROMPT_OVERHEAD_TOKENS = 20
+
 
 def analyze_scripts(
     conversations: List[Conversation],
     similarity_threshold: float = 85.0,
-    min_cluster_size: int = 2
+    min_cluster_size: int = 2,
+    max_concurrent_api_calls: int = 5
 ) -> Dict[str, List[ScriptPattern]]:
     """
     Analyze and cluster CREATOR messages into script patterns.
@@ -30,6 +41,7 @@ def analyze_scripts(
         conversations: List of conversations to analyze
         similarity_threshold: Fuzzy match threshold (0-100)
         min_cluster_size: Minimum messages for a cluster
+        max_concurrent_api_calls: Maximum Gemini requests in flight
 
     Returns:
         Dict with categorized script patterns
@@ -57,7 +69,7 @@ def analyze_scripts(
     clusters = calculate_reply_rates(clusters)
 
     # Step 4 & 5: Categorize and generate topics
-    clusters = categorize_and_generate_topics(clusters)
+    clusters = categorize_and_generate_topics(clusters, max_concurrent_api_calls)
 
     # Convert to ScriptPattern models and group by category
     return group_by_category(clusters)
@@ -75,16 +87,18 @@ def extract_creator_messages(conversations: List[Conversation]) -> List[Dict]:
     for conv in conversations:
         actual_messages = conv.get_actual_messages()
 
+        # A LEAD replied after message i iff i precedes the last LEAD message
+        last_lead = next(
+            (j for j in range(len(actual_messages) - 1, -1, -1) if actual_messages[j].sender == "LEAD"),
+            -1
+        )
+
         for i, msg in enumerate(actual_messages):
             if msg.sender != "CREATOR":
                 continue
 
             # Check if LEAD replied after this message
-            has_reply = False
-            for future_msg in actual_messages[i+1:]:
-                if future_msg.sender == "LEAD":
-                    has_reply = True
-                    break
+            has_reply = i < last_lead
 
             # Get context (previous messages)
             context = []
@@ -120,30 +134,56 @@ def cluster_messages(
         List of cluster dicts with example, messages, count
     """
     clusters = []
+    # Cluster of each token set seen so far. token_set_ratio only depends on
+    # a text's token set, so a message whose (non-empty) token set was seen
+    # before lands in the same cluster as that earlier message: the clusters
+    # before it score the same, and a cluster it opened scores 100. Exact
+    # repeats and reordered/re-spaced template variants are only scored once.
+    cluster_by_tokens: Dict[str, Dict] = {}
+    reuse_clusters = threshold <= 100
 
     for msg in messages:
-        matched = False
         text = msg["text"]
+        tokens = token_set_key(text)
+        cluster = cluster_by_tokens.get(tokens)
 
-        for cluster in clusters:
-            similarity = fuzz.token_set_ratio(text, cluster['example'])
+        if cluster is None:
+            for candidate in clusters:
+                # score_cutoff lets rapidfuzz bail out early on clear misses
+                similarity = fuzz.token_set_ratio(text, candidate['example'], score_cutoff=threshold)
 
-            if similarity >= threshold:
-                cluster['messages'].append(msg)
-                cluster['count'] += 1
-                matched = True
-                break
+                if similarity >= threshold:
+                    cluster = candidate
+                    break
 
-        if not matched:
-            clusters.append({
+        if cluster is not None:
+            cluster['messages'].append(msg)
+            cluster['count'] += 1
+        else:
+            cluster = {
                 'example': text,
                 'messages': [msg],
                 'count': 1
-            })
+            }
+            clusters.append(cluster)
+
+        if tokens and reuse_clusters:
+            cluster_by_tokens[tokens] = cluster
 
     return clusters
 
 
+def token_set_key(text: str) -> str:
+    """
+    Canonical form of a text's token set, as seen by fuzz.token_set_ratio.
+
+    Splits on ASCII whitespace only: rapidfuzz also splits on it, while
+    Python's str.split() additionally splits on characters rapidfuzz keeps
+    inside tokens (e.g. U+00A0). Equal keys therefore imply equal token sets.
+    """
+    return " ".join(sorted(set(_ASCII_WHITESPACE.split(text)) - {""}))
+
+
 def calculate_reply_rates(clusters: List[Dict]) -> List[Dict]:
     """
     Calculate reply rates for each cluster.
@@ -165,7 +205,10 @@ def calculate_reply_rates(clusters: List[Dict]) -> List[Dict]:
     return clusters
 
 
-def categorize_and_generate_topics(clusters: List[Dict]) -> List[Dict]:
+def categorize_and_generate_topics(
+    clusters: List[Dict],
+    max_concurrent_api_calls: int = 5
+) -> List[Dict]:
     """
     Use Gemini to categorize scripts and generate topics in batches.
 
@@ -176,86 +219,117 @@ def categorize_and_generate_topics(clusters: List[Dict]) -> List[Dict]:
     - cta: Call to action - inviting/pushing leads to take final step
 
     Batching strategy:
-    - Initial batch size: 20 scripts
-    - Retry strategy: Failed batches retry as individual items (batch size 1)
-    - Rate limiting: 0.3s between initial batches, 0.5s for retries
+    - Batches are packed by estimated prompt tokens (SCRIPT_BATCH_MAX_TOKENS),
+      capped at SCRIPT_BATCH_MAX_SIZE scripts
+    - Retry strategy: Failed batches are re-packed with half the token budget
+      until they fail as single scripts
+    - Rate limiting: at most max_concurrent_api_calls requests in flight
+      (batches are independent, so they run concurrently)
 
     Args:
         clusters: List of cluster dicts
+        max_concurrent_api_calls: Maximum Gemini requests in flight
 
     Returns:
         Clusters with category and topic added
     """
-    import time
-
-    # Phase 1: Initial batching with size 20
-    initial_batch_size = 20
-    retry_queue = []
-
-    # Split into batches of 20
-    initial_batches = [
-        clusters[i:i + initial_batch_size]
-        for i in range(0, len(clusters), initial_batch_size)
-    ]
-
-    logger.info(f"Processing {len(clusters)} clusters in {len(initial_batches)} batches of {initial_batch_size}")
-
-    for batch_idx, batch in enumerate(initial_batches):
-        try:
-            logger.info(f"Processing batch {batch_idx + 1}/{len(initial_batches)} ({len(batch)} scripts)")
-            results = categorize_batch_with_context(batch)
-
-            # Apply results to this batch
-            for idx, cluster in enumerate(batch):
-                script_id = f"script_{idx}"
-                if script_id in results:
-                    cluster['category'] = results[script_id].get('category')
-                    cluster['topic'] = results[script_id].get('topic')
-                else:
-                    cluster['category'] = None
-                    cluster['topic'] = None
-
-            logger.info(f"✓ Batch {batch_idx + 1} succeeded")
-
-        except Exception as e:
-            logger.warning(f"✗ Batch {batch_idx + 1} failed: {e}")
-            # Add all items from this batch to retry queue
-            retry_queue.extend(batch)
-
-        # Rate limiting between batches
-        if batch_idx < len(initial_batches) - 1:
-            time.sleep(0.3)
-
-    # Phase 2: Retry failed items individually
-    if retry_queue:
-        logger.info(f"Retrying {len(retry_queue)} failed scripts individually...")
-
-        for retry_idx, cluster in enumerate(retry_queue):
-            try:
-                logger.info(f"Retrying script {retry_idx + 1}/{len(retry_queue)}")
-                results = categorize_batch_with_context([cluster])
-
-                # Apply result (single item batch)
-                script_id = "script_0"
-                if script_id in results:
-                    cluster['category'] = results[script_id].get('category')
-                    cluster['topic'] = results[script_id].get('topic')
-                else:
-                    cluster['category'] = None
-                    cluster['topic'] = None
-
-            except Exception as e:
-                logger.warning(f"✗ Individual retry failed: {e}")
-                cluster['category'] = None
-                cluster['topic'] = None
-
-            # Slower rate limiting for retries
-            if retry_idx < len(retry_queue) - 1:
-                time.sleep(0.5)
+    max_tokens = SCRIPT_BATCH_MAX_TOKENS
+    batches = pack_script_batches(clusters, max_tokens)
+
+    logger.info(f"Processing {len(clusters)} clusters in {len(batches)} batches (≤{max_tokens} tokens each)")
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrent_api_calls)) as executor:
+        attempt = 1
+        while batches:
+            succeeded = list(executor.map(
+                categorize_batch_in_place, batches, range(1, len(batches) + 1)
+            ))
+
+            # Re-split failed batches with half the budget; single scripts give up
+            max_tokens //= 2
+            retry_batches = []
+            for batch, ok in zip(batches, succeeded):
+                if ok:
+                    continue
+                if len(batch) == 1:
+                    batch[0]['category'] = None
+                    batch[0]['topic'] = None
+                    continue
+                split = pack_script_batches(batch, max_tokens)
+                if len(split) == 1:
+                    half = len(batch) // 2
+                    split = [batch[:half], batch[half:]]
+                retry_batches.extend(split)
+
+            batches = retry_batches
+            attempt += 1
+            if batches:
+                logger.info(f"Retry {attempt - 1}: {len(batches)} batches (≤{max_tokens} tokens each)")
 
     return clusters
 
 
+def estimate_script_tokens(cluster: Dict) -> int:
+    """Rough prompt token count of one script entry (~4 characters per token)."""
+    context = cluster['messages'][0].get('context', [])
+    chars = len(cluster['example']) + sum(
+        len(ctx_msg.get('content', '')[:100]) for ctx_msg in context[-3:]
+    )
+    return SCRIPT_PROMPT_OVERHEAD_TOKENS + chars // 4
+
+
+def pack_script_batches(clusters: List[Dict], max_tokens: int) -> List[List[Dict]]:
+    """
+    Greedily pack clusters into batches under a token budget.
+
+    Clusters are taken shortest first so short scripts share batches; a
+    cluster larger than the budget gets a batch of its own.
+    """
+    batches = []
+    batch: List[Dict] = []
+    batch_tokens = 0
+    for tokens, cluster in sorted(
+        ((estimate_script_tokens(cluster), cluster) for cluster in clusters),
+        key=lambda item: item[0]
+    ):
+        if batch and (batch_tokens + tokens > max_tokens or len(batch) >= SCRIPT_BATCH_MAX_SIZE):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(cluster)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def categorize_batch_in_place(batch: List[Dict], batch_number: int) -> bool:
+    """
+    Categorize one batch of clusters, setting category and topic on each.
+
+    Returns:
+        True on success, False if the batch should be retried in smaller pieces
+    """
+    try:
+        logger.info(f"Processing batch {batch_number} ({len(batch)} scripts)")
+        results = categorize_batch_with_context(batch)
+    except Exception as e:
+        logger.warning(f"✗ Batch {batch_number} failed: {e}")
+        return False
+
+    # Apply results to this batch
+    for idx, cluster in enumerate(batch):
+        script_id = f"script_{idx}"
+        if script_id in results:
+            cluster['category'] = results[script_id].get('category')
+            cluster['topic'] = results[script_id].get('topic')
+        else:
+            cluster['category'] = None
+            cluster['topic'] = None
+
+    logger.info(f"✓ Batch {batch_number} succeeded")
+    return True
+
+
 def categorize_batch_with_context(clusters: List[Dict]) -> Dict:
     """
     Categorize a batch of scripts with conversation context.
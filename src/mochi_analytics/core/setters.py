@@ -1,206 +1,225 @@
 """Setter analysis - per-setter performance metrics."""
 
-from typing import List, Dict
-from collections import Counter, defaultdict
+from typing import List, Dict, Optional, Tuple
+import numpy as np
 from mochi_analytics.core.models import Conversation, SetterMetrics
-from mochi_analytics.core.metrics import parse_timestamp, calculate_time_difference_seconds
+from mochi_analytics.core.batch import ConversationBatch
+from mochi_analytics.core.metrics import REPLY_WINDOW_SECONDS, median_seconds
 from mochi_analytics.core.constants import TIME_BINS, STAGE_TYPES
-import statistics
 
 
-def analyze_setters_by_sender(conversations: List[Conversation]) -> Dict[str, SetterMetrics]:
+def analyze_setters(
+    conversations: List[Conversation],
+    batch: Optional[ConversationBatch] = None
+) -> Tuple[Dict[str, SetterMetrics], Dict[str, SetterMetrics]]:
     """
-    Analyze setter performance based on who sent each message.
+    Analyze setter performance in both attribution modes.
 
-    Each message is attributed to the person who sent it.
-    Shows individual message-sending performance.
-    """
-    def create_setter_data():
-        return {
-            'conversations': set(),
-            'messages_sent': 0,
-            'creator_messages_with_reply': 0,
-            'total_creator_messages': 0,
-            'reply_delays': [],
-            'stage_changes': {stage: 0 for stage in STAGE_TYPES},
-            'setter_activity': {bin: 0 for bin in TIME_BINS},
-            'lead_activity': {bin: 0 for bin in TIME_BINS},
-            'delayed_responses': {bin: 0 for bin in TIME_BINS}
-        }
-
-    setter_data = defaultdict(create_setter_data)
-
-    for conv in conversations:
-        # Track stage for each setter involved
-        setters_in_conv = set()
-
-        # Get actual messages (filter out status changes)
-        messages = conv.get_actual_messages()
-
-        for i, msg in enumerate(messages):
-            if msg.sender == "CREATOR":
-                # Attribute to sender - only use sent_by field (no fallback)
-                setter = msg.sent_by
-                if not setter:
-                    continue  # Skip messages without sent_by
-                setters_in_conv.add(setter)
-
-                data = setter_data[setter]
-                data['conversations'].add(conv.id)
-                data['messages_sent'] += 1
-                data['total_creator_messages'] += 1
-
-                # Time bin
-                msg_time = parse_timestamp(msg.timestamp)
-                time_bin = get_time_bin(msg_time.hour)
-                data['setter_activity'][time_bin] = data['setter_activity'].get(time_bin, 0) + 1
-
-                # Check for reply
-                reply_found = False
-                for future_msg in messages[i+1:]:
-                    if future_msg.sender == "LEAD":
-                        future_time = parse_timestamp(future_msg.timestamp)
-                        time_diff = (future_time - msg_time).total_seconds()
-
-                        if time_diff <= 48 * 3600:
-                            reply_found = True
-                            data['reply_delays'].append(time_diff)
-                        break
-
-                if reply_found:
-                    data['creator_messages_with_reply'] += 1
-
-            elif msg.sender == "LEAD":
-                # Track lead activity (for all setters in conversation)
-                msg_time = parse_timestamp(msg.timestamp)
-                time_bin = get_time_bin(msg_time.hour)
-
-                for setter in setters_in_conv:
-                    setter_data[setter]['lead_activity'][time_bin] = setter_data[setter]['lead_activity'].get(time_bin, 0) + 1
-
-        # Add stage changes for all setters involved
-        if conv.stage:
-            for setter in setters_in_conv:
-                setter_data[setter]['stage_changes'][conv.stage] = setter_data[setter]['stage_changes'].get(conv.stage, 0) + 1
+    Messages, timestamps, time bins and reply delays are computed once on
+    the shared batch and reused by both views.
 
-    # Convert to SetterMetrics
-    result = {}
-    for setter, data in setter_data.items():
-        reply_rate = (
-            (data['creator_messages_with_reply'] / data['total_creator_messages'] * 100)
-            if data['total_creator_messages'] > 0 else 0.0
-        )
+    Returns:
+        (by sender, by assignment)
+    """
+    if batch is None:
+        batch = ConversationBatch.from_conversations(conversations)
 
-        median_delay = int(statistics.median(data['reply_delays'])) if data['reply_delays'] else 0
+    return (
+        analyze_setters_by_sender(conversations, batch=batch),
+        analyze_setters_by_assignment(conversations, batch=batch)
+    )
 
-        result[setter] = SetterMetrics(
-            total_conversations=len(data['conversations']),
-            total_messages_sent_from_mochi=data['messages_sent'],
-            creator_messages_with_reply_within_48h=data['creator_messages_with_reply'],
-            creator_message_reply_rate_within_48h=round(reply_rate, 2),
-            median_reply_delay_seconds=median_delay,
-            stage_changes=data['stage_changes'],
-            setter_activity_by_time=data['setter_activity'],
-            lead_activity_by_time=data['lead_activity'],
-            delayed_responses_by_time=data['delayed_responses']
-        )
 
-    return result
+def analyze_setters_by_sender(
+    conversations: List[Conversation],
+    batch: Optional[ConversationBatch] = None
+) -> Dict[str, SetterMetrics]:
+    """
+    Analyze setter performance based on who sent each message.
 
+    Each message is attributed to the person who sent it.
+    Shows individual message-sending performance.
 
-def analyze_setters_by_assignment(conversations: List[Conversation]) -> Dict[str, SetterMetrics]:
+    Args:
+        conversations: Conversations to analyze
+        batch: Prebuilt ConversationBatch for these conversations (built if omitted)
+    """
+    if batch is None:
+        batch = ConversationBatch.from_conversations(conversations)
+
+    # Attribute to sender - only use sent_by field (no fallback);
+    # setter ids follow first appearance, -1 marks unattributed messages
+    setter_ids: Dict[str, int] = {}
+    msg_setter = np.full(len(batch), -1, dtype=np.int64)
+    for pos in np.flatnonzero(batch.is_creator).tolist():
+        setter = batch.messages[pos].sent_by
+        if setter:
+            msg_setter[pos] = setter_ids.setdefault(setter, len(setter_ids))
+    n_setters = len(setter_ids)
+
+    # First message of each (conversation, setter) pair, in conversation order
+    attributed = np.flatnonzero(msg_setter >= 0)
+    _, first = np.unique(
+        batch.conv_index[attributed] * n_setters + msg_setter[attributed], return_index=True
+    )
+    pair_pos = attributed[first]
+    pair_conv = batch.conv_index[pair_pos]
+    pair_setter = msg_setter[pair_pos]
+
+    # Lead activity counts for every setter who had already written in the
+    # conversation: lead messages after the pair's first message
+    lead_activity = np.zeros((n_setters, len(TIME_BINS)), dtype=np.int64)
+    conv_end = batch.conv_offsets[pair_conv + 1]
+    for b in range(len(TIME_BINS)):
+        leads_before = np.concatenate(([0], np.cumsum(batch.is_lead & (batch.time_bins == b))))
+        np.add.at(lead_activity[:, b], pair_setter, leads_before[conv_end] - leads_before[pair_pos + 1])
+
+    # Conversations and stage changes for all setters involved
+    conversation_ids = [set() for _ in range(n_setters)]
+    stage_changes = [{stage: 0 for stage in STAGE_TYPES} for _ in range(n_setters)]
+    for c, setter in zip(pair_conv.tolist(), pair_setter.tolist()):
+        conv = conversations[c]
+        conversation_ids[setter].add(conv.id)
+        stage = conv.stage
+        if stage:
+            stage_changes[setter][stage] = stage_changes[setter].get(stage, 0) + 1
+
+    creator_setter = msg_setter[batch.is_creator]
+    sent = creator_setter >= 0
+    return summarize_setters(
+        list(setter_ids),
+        creator_setter[sent],
+        batch.time_bins[batch.is_creator][sent],
+        batch.creator_reply_delays[sent],
+        lead_activity,
+        conversation_ids,
+        stage_changes
+    )
+
+
+def analyze_setters_by_assignment(
+    conversations: List[Conversation],
+    batch: Optional[ConversationBatch] = None
+) -> Dict[str, SetterMetrics]:
     """
     Analyze setter performance based on conversation assignment.
 
     Entire conversation is attributed to assigned setter (setter_email).
     Shows overall conversation ownership.
+
+    Args:
+        conversations: Conversations to analyze
+        batch: Prebuilt ConversationBatch for these conversations (built if omitted)
     """
-    def create_setter_data():
-        return {
-            'conversations': set(),
-            'messages_sent': 0,
-            'creator_messages_with_reply': 0,
-            'total_creator_messages': 0,
-            'reply_delays': [],
-            'stage_changes': {stage: 0 for stage in STAGE_TYPES},
-            'setter_activity': {bin: 0 for bin in TIME_BINS},
-            'lead_activity': {bin: 0 for bin in TIME_BINS},
-            'delayed_responses': {bin: 0 for bin in TIME_BINS}
-        }
-
-    setter_data = defaultdict(create_setter_data)
-
-    for conv in conversations:
-        setter = conv.setter_email
-        data = setter_data[setter]
+    if batch is None:
+        batch = ConversationBatch.from_conversations(conversations)
+
+    setter_ids: Dict[Optional[str], int] = {}
+    conversation_ids: List[set] = []
+    stage_changes: List[Dict[str, int]] = []
+    conv_setter = np.empty(len(conversations), dtype=np.int64)
+    for c, conv in enumerate(conversations):
+        setter = setter_ids.setdefault(conv.setter_email, len(setter_ids))
+        if setter == len(conversation_ids):
+            conversation_ids.append(set())
+            stage_changes.append({stage: 0 for stage in STAGE_TYPES})
+        conv_setter[c] = setter
 
         # Add conversation
-        data['conversations'].add(conv.id)
+        conversation_ids[setter].add(conv.id)
 
         # Add stage
-        if conv.stage:
-            data['stage_changes'][conv.stage] = data['stage_changes'].get(conv.stage, 0) + 1
-
-        # Get actual messages (filter out status changes)
-        messages = conv.get_actual_messages()
-
-        # Process messages
-        for i, msg in enumerate(messages):
-            if msg.sender == "CREATOR":
-                data['messages_sent'] += 1
-                data['total_creator_messages'] += 1
-
-                # Time bin
-                msg_time = parse_timestamp(msg.timestamp)
-                time_bin = get_time_bin(msg_time.hour)
-                data['setter_activity'][time_bin] = data['setter_activity'].get(time_bin, 0) + 1
-
-                # Check for reply
-                reply_found = False
-                for future_msg in messages[i+1:]:
-                    if future_msg.sender == "LEAD":
-                        future_time = parse_timestamp(future_msg.timestamp)
-                        time_diff = (future_time - msg_time).total_seconds()
-
-                        if time_diff <= 48 * 3600:
-                            reply_found = True
-                            data['reply_delays'].append(time_diff)
-                        break
-
-                if reply_found:
-                    data['creator_messages_with_reply'] += 1
-
-            elif msg.sender == "LEAD":
-                # Track lead activity
-                msg_time = parse_timestamp(msg.timestamp)
-                time_bin = get_time_bin(msg_time.hour)
-                data['lead_activity'][time_bin] = data['lead_activity'].get(time_bin, 0) + 1
+        stage = conv.stage
+        if stage:
+            stage_changes[setter][stage] = stage_changes[setter].get(stage, 0) + 1
+
+    # Every message belongs to its conversation's assigned setter
+    msg_setter = conv_setter[batch.conv_index]
+    n_bins = len(TIME_BINS)
+    lead_activity = np.bincount(
+        msg_setter[batch.is_lead] * n_bins + batch.time_bins[batch.is_lead],
+        minlength=len(setter_ids) * n_bins
+    ).reshape(len(setter_ids), n_bins)
+
+    return summarize_setters(
+        list(setter_ids),
+        msg_setter[batch.is_creator],
+        batch.time_bins[batch.is_creator],
+        batch.creator_reply_delays,
+        lead_activity,
+        conversation_ids,
+        stage_changes
+    )
+
+
+def summarize_setters(
+    setters: list,
+    creator_setter: np.ndarray,
+    creator_bins: np.ndarray,
+    creator_delays: np.ndarray,
+    lead_activity: np.ndarray,
+    conversation_ids: List[set],
+    stage_changes: List[Dict[str, int]]
+) -> Dict[str, SetterMetrics]:
+    """
+    Build SetterMetrics from per-message arrays.
+
+    Args:
+        setters: Setter keys, indexed by setter id
+        creator_setter: Setter id of each attributed CREATOR message
+        creator_bins: TIME_BINS index of each of those messages
+        creator_delays: Delay to the next LEAD message for each of them (inf if none)
+        lead_activity: Lead message counts per setter and time bin
+        conversation_ids: Conversation ids per setter
+        stage_changes: Stage counts per setter
+    """
+    n_setters = len(setters)
+    n_bins = len(TIME_BINS)
+
+    messages_sent = np.bincount(creator_setter, minlength=n_setters).tolist()
+    setter_activity = np.bincount(
+        creator_setter * n_bins + creator_bins, minlength=n_setters * n_bins
+    ).reshape(n_setters, n_bins).tolist()
+
+    # Replies within 48h, with the delays grouped by setter
+    replied = creator_delays <= REPLY_WINDOW_SECONDS
+    reply_setter = creator_setter[replied]
+    with_reply = np.bincount(reply_setter, minlength=n_setters)
+    reply_delays = np.split(
+        creator_delays[replied][np.argsort(reply_setter, kind='stable')],
+        np.cumsum(with_reply)[:-1]
+    )
+    with_reply = with_reply.tolist()
+    lead_activity = lead_activity.tolist()
 
     # Convert to SetterMetrics
     result = {}
-    for setter, data in setter_data.items():
+    for i, setter in enumerate(setters):
         reply_rate = (
-            (data['creator_messages_with_reply'] / data['total_creator_messages'] * 100)
-            if data['total_creator_messages'] > 0 else 0.0
+            (with_reply[i] / messages_sent[i] * 100)
+            if messages_sent[i] > 0 else 0.0
         )
 
-        median_delay = int(statistics.median(data['reply_delays'])) if data['reply_delays'] else 0
-
         result[setter] = SetterMetrics(
-            total_conversations=len(data['conversations']),
-            total_messages_sent_from_mochi=data['messages_sent'],
-            creator_messages_with_reply_within_48h=data['creator_messages_with_reply'],
+            total_conversations=len(conversation_ids[i]),
+            total_messages_sent_from_mochi=messages_sent[i],
+            creator_messages_with_reply_within_48h=with_reply[i],
             creator_message_reply_rate_within_48h=round(reply_rate, 2),
-            median_reply_delay_seconds=median_delay,
-            stage_changes=data['stage_changes'],
-            setter_activity_by_time=data['setter_activity'],
-            lead_activity_by_time=data['lead_activity'],
-            delayed_responses_by_time=data['delayed_responses']
+            median_reply_delay_seconds=median_seconds(reply_delays[i]),
+            stage_changes=stage_changes[i],
+            setter_activity_by_time=dict(zip(TIME_BINS, setter_activity[i])),
+            lead_activity_by_time=dict(zip(TIME_BINS, lead_activity[i])),
+            delayed_responses_by_time={bin: 0 for bin in TIME_BINS}
         )
 
     return result
 
 
+def get_time_bin_index(hour: int) -> int:
+    """Index into TIME_BINS of an hour of day (0-23); bins are 3 hours wide."""
+    return min(hour // 3, len(TIME_BINS) - 1)
+
+
 def get_time_bin(hour: int) -> str:
     """
     Convert hour (0-23) to time bin (e.g., '09_12').
@@ -211,19 +230,4 @@ def get_time_bin(hour: int) -> str:
     Returns:
         Time bin string (e.g., '09_12' for 9 AM - 12 PM)
     """
-    if 0 <= hour < 3:
-        return "00_03"
-    elif 3 <= hour < 6:
-        return "03_06"
-    elif 6 <= hour < 9:
-        return "06_09"
-    elif 9 <= hour < 12:
-        return "09_12"
-    elif 12 <= hour < 15:
-        return "12_15"
-    elif 15 <= hour < 18:
-        return "15_18"
-    elif 18 <= hour < 21:
-        return "18_21"
-    else:  # 21-24
-        return "21_24"
+    return TIME_BINS[get_time_bin_index(hour)]
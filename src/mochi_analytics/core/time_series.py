@@ -4,9 +4,9 @@ from typing import List
 from datetime import datetime, timedelta
 from collections import Counter, defaultdict
 from mochi_analytics.core.models import Conversation, TimeSeries, DayStages
-from mochi_analytics.core.metrics import parse_timestamp
-from mochi_analytics.core.setters import get_time_bin
-from mochi_analytics.core.constants import STAGE_TYPES
+from mochi_analytics.core.timestamps import get_timezone, parse_timestamp
+from mochi_analytics.core.setters import get_time_bin_index
+from mochi_analytics.core.constants import STAGE_TYPES, TIME_BINS
 import pytz
 
 
@@ -22,16 +22,15 @@ def analyze_time_series(
     Returns:
         TimeSeries with daily stage changes and activity by time of day
     """
-    tz = pytz.timezone(timezone_str)
+    tz = get_timezone(timezone_str)
 
     # Initialize data structures
     daily_stages = defaultdict(Counter)
 
-    # Initialize all time bins with 0
-    all_time_bins = ["00_03", "03_06", "06_09", "09_12", "12_15", "15_18", "18_21", "21_24"]
-    lead_activity = {bin: 0 for bin in all_time_bins}
-    setter_activity = {bin: 0 for bin in all_time_bins}
-    delayed_responses = {bin: 0 for bin in all_time_bins}
+    # Counts per TIME_BINS index (turned into dicts at the end)
+    lead_activity = [0] * len(TIME_BINS)
+    setter_activity = [0] * len(TIME_BINS)
+    delayed_responses = [0] * len(TIME_BINS)
 
     # Process conversations
     for conv in conversations:
@@ -43,8 +42,9 @@ def analyze_time_series(
         conv_date = conv_time_local.date()
 
         # Count stage change on creation date
-        if conv.stage:
-            daily_stages[conv_date][conv.stage] += 1
+        stage = conv.stage
+        if stage:
+            daily_stages[conv_date][stage] += 1
 
         # Get actual messages (filter out status changes)
         messages = conv.get_actual_messages()
@@ -56,12 +56,12 @@ def analyze_time_series(
                 msg_time = pytz.UTC.localize(msg_time)
             msg_time_local = msg_time.astimezone(tz)
 
-            time_bin = get_time_bin(msg_time_local.hour)
+            time_bin = get_time_bin_index(msg_time_local.hour)
 
             if msg.sender == "LEAD":
-                lead_activity[time_bin] = lead_activity.get(time_bin, 0) + 1
+                lead_activity[time_bin] += 1
             elif msg.sender == "CREATOR":
-                setter_activity[time_bin] = setter_activity.get(time_bin, 0) + 1
+                setter_activity[time_bin] += 1
 
                 # Check for delayed response (> 24h before creator replied)
                 if i > 0:
@@ -73,7 +73,7 @@ def analyze_time_series(
 
                         delay = (msg_time - prev_time).total_seconds()
                         if delay > 24 * 3600:  # More than 24 hours
-                            delayed_responses[time_bin] = delayed_responses.get(time_bin, 0) + 1
+                            delayed_responses[time_bin] += 1
 
     # Build day-by-day breakdown
     stage_changes_by_day = []
@@ -106,7 +106,7 @@ def analyze_time_series(
 
     return TimeSeries(
         stage_changes_by_day=stage_changes_by_day,
-        lead_activity_by_time=lead_activity,
-        setter_activity_by_time=setter_activity,
-        delayed_responses_by_time=delayed_responses
+        lead_activity_by_time=dict(zip(TIME_BINS, lead_activity)),
+        setter_activity_by_time=dict(zip(TIME_BINS, setter_activity)),
+        delayed_responses_by_time=dict(zip(TIME_BINS, delayed_responses))
     )
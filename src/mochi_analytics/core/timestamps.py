@@ -0,0 +1,70 @@
+"""Timestamp parsing helpers."""
+
+import math
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from typing import Optional
+from functools import lru_cache
+
+import pytz
+
+
+# Bounded: the same timestamps are parsed by several analysis passes
+# (batch building, setters, time series), but they are unique per message
+@lru_cache(maxsize=65536)
+def parse_timestamp(timestamp_str: str) -> datetime:
+    """
+    Parse ISO format timestamp to datetime.
+
+    Handles multiple formats:
+    - 2025-01-15T10:30:00Z
+    - 2025-01-15T10:30:00+00:00
+    - 2025-01-15T10:30:00
+    """
+    # Remove 'Z' if present and replace with +00:00
+    if timestamp_str.endswith('Z'):
+        timestamp_str = timestamp_str[:-1] + '+00:00'
+
+    try:
+        # Try parsing with timezone
+        return datetime.fromisoformat(timestamp_str)
+    except ValueError:
+        # Fallback: parse without timezone and assume UTC
+        try:
+            return datetime.fromisoformat(timestamp_str)
+        except ValueError:
+            # Last resort: parse date only
+            return datetime.fromisoformat(timestamp_str.split('T')[0])
+
+
+def to_epoch_seconds(timestamp_str: str) -> float:
+    """Convert a timestamp to epoch seconds, treating naive values as UTC."""
+    dt = parse_timestamp(timestamp_str)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+@lru_cache(maxsize=256)
+def get_timezone(name: str) -> tzinfo:
+    """Look up an IANA timezone, memoized across requests and organizations."""
+    return pytz.timezone(name)
+
+
+def local_date_bounds(
+    tz: tzinfo,
+    date_from: Optional[date],
+    date_to: Optional[date]
+) -> tuple[float, float]:
+    """
+    Epoch-second range [start, end) covering the local days date_from..date_to in tz.
+
+    A timestamp falls on one of those days (in tz) exactly when its epoch
+    seconds are in the range, so date filters become two float comparisons
+    instead of a timezone conversion per message. Open ends are -inf / inf.
+    """
+    start = tz.localize(datetime.combine(date_from, time.min)).timestamp() if date_from else -math.inf
+    end = (
+        tz.localize(datetime.combine(date_to + timedelta(days=1), time.min)).timestamp()
+        if date_to else math.inf
+    )
+    return start, end
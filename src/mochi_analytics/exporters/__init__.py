@@ -3,7 +3,7 @@ Export formatters for various output formats.
 """
 
 from mochi_analytics.exporters.csv import export_framer_csv
-from mochi_analytics.exporters.json import export_json, export_json_dict
+from mochi_analytics.exporters.json import export_json, export_json_dict, export_json_from_dict
 from mochi_analytics.exporters.slack import (
     export_slack_blocks,
     export_slack_message,
@@ -13,6 +13,7 @@ __all__ = [
     # JSON
     "export_json",
     "export_json_dict",
+    "export_json_from_dict",
     # CSV (Framer CMS)
     "export_framer_csv",
     # Slack Block Kit
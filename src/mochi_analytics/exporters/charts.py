@@ -1,8 +1,7 @@
-"""Chart generation using Plotly with base64 encoding for database storage."""
+"""Chart generation using Plotly, rendered to PNG bytes for database storage."""
 
 from typing import List, Dict, Optional
 import plotly.graph_objects as go
-import base64
 import tomli
 from pathlib import Path
 from mochi_analytics.core.models import DayStages
@@ -30,7 +29,7 @@ def load_chart_configs(config_path: str) -> Dict:
 def generate_all_charts(
     time_series_data: List[DayStages],
     config_path: str
-) -> Dict[str, str]:
+) -> Dict[str, bytes]:
     """
     Generate all charts from configuration.
 
@@ -39,7 +38,7 @@ def generate_all_charts(
         config_path: Path to charts.toml configuration file
 
     Returns:
-        Dict mapping chart_id to base64-encoded PNG string
+        Dict mapping chart_id to PNG bytes
     """
     config = load_chart_configs(config_path)
     global_config = config.get("global", {})
@@ -50,8 +49,7 @@ def generate_all_charts(
     for chart_config in chart_configs:
         try:
             chart_id = chart_config["id"]
-            png_base64 = generate_chart(time_series_data, chart_config, global_config)
-            results[chart_id] = png_base64
+            results[chart_id] = generate_chart(time_series_data, chart_config, global_config)
             logger.info(f"✓ Generated chart: {chart_id}")
         except Exception as e:
             logger.error(f"✗ Failed to generate chart {chart_config.get('id', 'unknown')}: {e}")
@@ -63,7 +61,7 @@ def generate_chart(
     time_series_data: List[DayStages],
     chart_config: Dict,
     global_config: Dict
-) -> str:
+) -> bytes:
     """
     Generate a single PNG chart from time series data.
 
@@ -73,7 +71,7 @@ def generate_chart(
         global_config: Global chart settings
 
     Returns:
-        Base64-encoded PNG string
+        PNG image bytes
     """
     fig = go.Figure()
 
@@ -152,22 +150,17 @@ def generate_chart(
         logger.error(f"Failed to render PNG: {e}")
         raise
 
-    # Encode to base64
-    png_base64 = base64.b64encode(png_bytes).decode('utf-8')
+    return png_bytes
 
-    return png_base64
 
-
-def save_chart_to_file(png_base64: str, output_path: str):
+def save_chart_to_file(png_bytes: bytes, output_path: str):
     """
-    Save base64-encoded PNG to file.
+    Save PNG bytes to file.
 
     Args:
-        png_base64: Base64-encoded PNG string
+        png_bytes: PNG image bytes
         output_path: Output file path
     """
-    png_bytes = base64.b64decode(png_base64)
-
     with open(output_path, "wb") as f:
         f.write(png_bytes)
 
@@ -2,6 +2,8 @@
 JSON export functionality.
 """
 
+import orjson
+
 from mochi_analytics.core.models import AnalysisResult
 
 
@@ -19,6 +21,23 @@ def export_json(result: AnalysisResult, indent: int = 2) -> str:
     return result.model_dump_json(indent=indent)
 
 
+def export_json_from_dict(data: dict, indent: bool = True) -> bytes:
+    """
+    Export an already-dumped analysis result to JSON bytes.
+
+    Use this when the result is stored as a dict (e.g. Job.result) to skip
+    re-validating it into AnalysisResult just to serialize it again.
+
+    Args:
+        data: Analysis result dictionary
+        indent: Indent with 2 spaces (default: True)
+
+    Returns:
+        UTF-8 encoded JSON bytes
+    """
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None)
+
+
 def export_json_dict(result: AnalysisResult) -> dict:
     """
     Export analysis result to dictionary.
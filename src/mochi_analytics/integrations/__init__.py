@@ -7,11 +7,14 @@ from mochi_analytics.integrations.airtable import (
     AirtableConfig,
     OrganizationConfig,
     SlackDailyConfig,
+    clear_airtable_cache,
     get_organization_by_id,
     get_organizations,
+    get_organizations_by_ids,
     get_slack_config_for_org,
     get_slack_configs,
 )
+from mochi_analytics.integrations.clients import close_shared_clients, get_shared_client
 from mochi_analytics.integrations.framer import (
     FramerAPIError,
     FramerClient,
@@ -32,6 +35,9 @@ from mochi_analytics.integrations.slack import (
 )
 
 __all__ = [
+    # Shared clients
+    "get_shared_client",
+    "close_shared_clients",
     # Mochi
     "MochiClient",
     "MochiConfig",
@@ -44,8 +50,10 @@ __all__ = [
     "SlackDailyConfig",
     "get_organizations",
     "get_organization_by_id",
+    "get_organizations_by_ids",
     "get_slack_configs",
     "get_slack_config_for_org",
+    "clear_airtable_cache",
     # Slack
     "SlackClient",
     "SlackConfig",
@@ -4,13 +4,61 @@ Airtable integration for organization configuration and Slack channel mappings.
 
 import logging
 import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from functools import wraps
 from typing import Any
 
 from pydantic import BaseModel, Field
 from pyairtable import Api
 
+from mochi_analytics.integrations.clients import get_shared_client
+
 logger = logging.getLogger(__name__)
 
+# IDs per OR() formula when fetching records in batches (keeps the request URL short)
+FORMULA_BATCH_SIZE = 50
+
+# Seconds to reuse organization / Slack config lists (0 disables caching)
+AIRTABLE_CACHE_TTL = float(os.getenv("AIRTABLE_CACHE_TTL", "60"))
+
+_caches: list[dict] = []
+
+
+def _ttl_cache(func: Callable[..., list]) -> Callable[..., list]:
+    """
+    Cache a list-returning lookup per argument set for AIRTABLE_CACHE_TTL seconds.
+
+    Config tables change minutes to hours apart, so repeated task runs and
+    debug calls can share one Airtable fetch. Callers get a shallow copy.
+    """
+    cache: dict[tuple, tuple[float, list]] = {}
+    lock = threading.Lock()
+    _caches.append(cache)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> list:
+        key = (args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        with lock:
+            entry = cache.get(key)
+        if entry is not None and now - entry[0] < AIRTABLE_CACHE_TTL:
+            return list(entry[1])
+
+        result = func(*args, **kwargs)
+        with lock:
+            cache[key] = (now, result)
+        return list(result)
+
+    return wrapper
+
+
+def clear_airtable_cache() -> None:
+    """Drop cached organization and Slack config lists (call after Airtable edits)."""
+    for cache in _caches:
+        cache.clear()
+
 
 class OrganizationConfig(BaseModel):
     """Configuration for a Mochi organization."""
@@ -105,34 +153,38 @@ class AirtableClient:
         self.slack_table = self.api.table(config.base_id, "Slack Daily")
         self.analysis_table = self.api.table(config.base_id, "Analysis")
 
-    def get_organizations(self, active_only: bool = True) -> list[OrganizationConfig]:
+    def get_organizations(
+        self,
+        active_only: bool = True,
+        name_contains: str | None = None
+    ) -> list[OrganizationConfig]:
         """
         Get all organization configurations.
 
         Args:
             active_only: If True, only return active organizations
+            name_contains: Optional case-insensitive substring the organization
+                name must contain (filtered by Airtable, not client-side)
 
         Returns:
             List of organization configurations
         """
-        formula = "{Active} = TRUE()" if active_only else None
+        conditions = []
+        if active_only:
+            conditions.append("{Active} = TRUE()")
+        if name_contains:
+            escaped = name_contains.lower().replace("\\", "\\\\").replace("'", "\\'")
+            conditions.append(f"FIND('{escaped}', LOWER({{Organization Name}})) > 0")
+
+        if not conditions:
+            formula = None
+        elif len(conditions) == 1:
+            formula = conditions[0]
+        else:
+            formula = f"AND({', '.join(conditions)})"
         records = self.orgs_table.all(formula=formula)
 
-        orgs = []
-        for record in records:
-            fields = record["fields"]
-            orgs.append(
-                OrganizationConfig(
-                    record_id=record["id"],
-                    organization_name=fields.get("Organization Name", ""),
-                    organization_id=fields.get("Organization ID", ""),
-                    timezone=fields.get("Timezone", "UTC"),
-                    instagram_username=fields.get("Instagram Username"),
-                    active=fields.get("Active", False)
-                )
-            )
-
-        return orgs
+        return [self._parse_organization(record) for record in records]
 
     def get_organization_by_id(self, org_id: str) -> OrganizationConfig | None:
         """
@@ -150,7 +202,59 @@ class AirtableClient:
         if not records:
             return None
 
-        record = records[0]
+        return self._parse_organization(records[0])
+
+    def get_organizations_by_ids(self, org_ids: Iterable[str]) -> dict[str, OrganizationConfig]:
+        """
+        Get organization configurations for several org IDs at once.
+
+        Issues one Airtable query per FORMULA_BATCH_SIZE IDs instead of
+        one query per organization.
+
+        Args:
+            org_ids: Mochi organization UUIDs
+
+        Returns:
+            Mapping of org ID to configuration (IDs not found are omitted)
+        """
+        org_ids = sorted(set(org_ids))
+        orgs: dict[str, OrganizationConfig] = {}
+
+        for start in range(0, len(org_ids), FORMULA_BATCH_SIZE):
+            batch = org_ids[start:start + FORMULA_BATCH_SIZE]
+            formula = "OR(" + ", ".join(f"{{Organization ID}} = '{org_id}'" for org_id in batch) + ")"
+            for record in self.orgs_table.all(formula=formula):
+                org = self._parse_organization(record)
+                orgs.setdefault(org.organization_id, org)
+
+        return orgs
+
+    @staticmethod
+    def _get_records_by_id(table: Any, record_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """
+        Fetch records by Airtable record ID, FORMULA_BATCH_SIZE per query.
+
+        Args:
+            table: pyairtable Table to read from
+            record_ids: Airtable record IDs
+
+        Returns:
+            Mapping of record ID to record
+        """
+        record_ids = sorted(set(record_ids))
+        records: dict[str, dict[str, Any]] = {}
+
+        for start in range(0, len(record_ids), FORMULA_BATCH_SIZE):
+            batch = record_ids[start:start + FORMULA_BATCH_SIZE]
+            formula = "OR(" + ", ".join(f"RECORD_ID() = '{record_id}'" for record_id in batch) + ")"
+            for record in table.all(formula=formula):
+                records[record["id"]] = record
+
+        return records
+
+    @staticmethod
+    def _parse_organization(record: dict[str, Any]) -> OrganizationConfig:
+        """Build an OrganizationConfig from a Mochi Organization record."""
         fields = record["fields"]
         return OrganizationConfig(
             record_id=record["id"],
@@ -175,6 +279,17 @@ class AirtableClient:
         records = self.slack_table.all(formula=formula)
         logger.info(f"Found {len(records)} Slack Daily records (active_only={active_only})")
 
+        # Prefetch linked Organization and Analysis records in batches instead of
+        # one request per link; anything missing falls back to a direct get()
+        linked_orgs = self._get_records_by_id(
+            self.orgs_table,
+            (r["fields"]["Organization"][0] for r in records if r["fields"].get("Organization"))
+        )
+        linked_analysis = self._get_records_by_id(
+            self.analysis_table,
+            (link for r in records for link in r["fields"].get("Analysis", []))
+        )
+
         configs = []
         for record in records:
             fields = record["fields"]
@@ -187,7 +302,7 @@ class AirtableClient:
 
             # Fetch the linked organization record to get the org ID
             org_record_id = org_links[0]
-            org_record = self.orgs_table.get(org_record_id)
+            org_record = linked_orgs.get(org_record_id) or self.orgs_table.get(org_record_id)
             org_id = org_record["fields"].get("Organization ID", "")
             org_name = org_record["fields"].get("Organization Name", "Unknown")
 
@@ -201,7 +316,7 @@ class AirtableClient:
                 logger.debug(f"Org {org_name}: found {len(analysis_links)} Analysis links")
                 for analysis_record_id in analysis_links:
                     try:
-                        analysis_record = self.analysis_table.get(analysis_record_id)
+                        analysis_record = linked_analysis.get(analysis_record_id) or self.analysis_table.get(analysis_record_id)
                         analysis_fields = analysis_record["fields"]
 
                         record_type = analysis_fields.get("Type", "")
@@ -245,7 +360,7 @@ class AirtableClient:
                                 member_configs = []
                                 for member_id in grouping_links:
                                     try:
-                                        member_record = self.analysis_table.get(member_id)
+                                        member_record = linked_analysis.get(member_id) or self.analysis_table.get(member_id)
                                         member_fields = member_record["fields"]
                                         # Only include script types
                                         if member_fields.get("Type") == "script":
@@ -318,25 +433,33 @@ class AirtableClient:
 
 
 # Convenience functions
-def get_organizations(active_only: bool = True) -> list[OrganizationConfig]:
+@_ttl_cache
+def get_organizations(active_only: bool = True, name_contains: str | None = None) -> list[OrganizationConfig]:
     """Get all organization configurations (convenience function)."""
-    client = AirtableClient()
-    return client.get_organizations(active_only=active_only)
+    client = get_shared_client(AirtableClient)
+    return client.get_organizations(active_only=active_only, name_contains=name_contains)
 
 
 def get_organization_by_id(org_id: str) -> OrganizationConfig | None:
     """Get organization by ID (convenience function)."""
-    client = AirtableClient()
+    client = get_shared_client(AirtableClient)
     return client.get_organization_by_id(org_id)
 
 
+def get_organizations_by_ids(org_ids: Iterable[str]) -> dict[str, OrganizationConfig]:
+    """Get organizations keyed by org ID (convenience function)."""
+    client = get_shared_client(AirtableClient)
+    return client.get_organizations_by_ids(org_ids)
+
+
+@_ttl_cache
 def get_slack_configs(active_only: bool = True) -> list[SlackDailyConfig]:
     """Get all Slack configurations (convenience function)."""
-    client = AirtableClient()
+    client = get_shared_client(AirtableClient)
     return client.get_slack_configs(active_only=active_only)
 
 
 def get_slack_config_for_org(org_id: str) -> SlackDailyConfig | None:
     """Get Slack config for organization (convenience function)."""
-    client = AirtableClient()
+    client = get_shared_client(AirtableClient)
     return client.get_slack_config_for_org(org_id)
@@ -0,0 +1,42 @@
+"""
+Process-wide integration clients.
+
+Convenience functions reuse one client per integration instead of opening
+a new HTTP client (and TCP/TLS connection) on every call. The underlying
+httpx/requests sessions pool keep-alive connections and are safe to share
+across worker threads.
+"""
+
+import threading
+from typing import TypeVar
+
+T = TypeVar("T")
+
+_clients: dict[type, object] = {}
+_clients_lock = threading.Lock()
+
+
+def get_shared_client(client_class: type[T]) -> T:
+    """
+    Get the shared instance of an integration client, creating it on first use.
+
+    The client is built from environment configuration; if that fails
+    (e.g. a missing API key) the error propagates and nothing is cached.
+    """
+    with _clients_lock:
+        client = _clients.get(client_class)
+        if client is None:
+            client = _clients[client_class] = client_class()
+        return client
+
+
+def close_shared_clients() -> None:
+    """Close all shared clients (called on application shutdown)."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+
+    for client in clients:
+        close = getattr(client, "close", None)
+        if close is not None:
+            close()
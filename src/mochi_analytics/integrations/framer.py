@@ -8,6 +8,8 @@ from typing import Any
 import httpx
 from pydantic import BaseModel, Field
 
+from mochi_analytics.integrations.clients import get_shared_client
+
 
 class FramerAPIError(Exception):
     """Raised when Framer API returns an error."""
@@ -111,9 +113,9 @@ def push_report(
     Returns:
         API response
     """
-    config = None
     if api_url:
-        config = FramerConfig(api_url=api_url)
+        with FramerClient(config=FramerConfig(api_url=api_url)) as client:
+            return client.push_report(report_data)
 
-    with FramerClient(config=config) as client:
-        return client.push_report(report_data)
+    # Default configuration: reuse the pooled process-wide client
+    return get_shared_client(FramerClient).push_report(report_data)
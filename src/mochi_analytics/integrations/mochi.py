@@ -2,16 +2,18 @@
 Mochi API integration for fetching conversation data.
 """
 
-import json
 import logging
 import os
 from datetime import date
 from typing import Any
 
 import httpx
+import orjson
 from json_repair import repair_json
 from pydantic import BaseModel, Field
 
+from mochi_analytics.integrations.clients import get_shared_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -103,10 +105,12 @@ class MochiClient:
 
             response.raise_for_status()
 
-            # Try to parse JSON, with auto-repair on failure
+            # Try to parse JSON, with auto-repair on failure.
+            # orjson parses the raw body bytes directly, skipping the decoded
+            # str copy that response.json() builds for large exports.
             try:
-                data = response.json()
-            except json.JSONDecodeError as json_err:
+                data = orjson.loads(response.content)
+            except orjson.JSONDecodeError as json_err:
                 logger.warning(f"JSON parse error: {json_err}. Attempting auto-repair...")
                 text = response.text.rstrip()
 
@@ -119,13 +123,13 @@ class MochiClient:
                     if last_brace > 0:
                         fixed = text[:last_brace + 1] + "]"
                         try:
-                            data = json.loads(fixed)
+                            data = orjson.loads(fixed)
                             logger.info("JSON bracket fix successful")
-                        except json.JSONDecodeError:
+                        except orjson.JSONDecodeError:
                             # If simple fix didn't work, try json_repair
                             try:
                                 repaired = repair_json(text)
-                                data = json.loads(repaired)
+                                data = orjson.loads(repaired)
                                 logger.info("JSON auto-repair successful")
                             except Exception as repair_err:
                                 raise MochiAPIError(
@@ -137,7 +141,7 @@ class MochiClient:
                     # Not a truncated array, try json_repair
                     try:
                         repaired = repair_json(text)
-                        data = json.loads(repaired)
+                        data = orjson.loads(repaired)
                         logger.info("JSON auto-repair successful")
                     except Exception as repair_err:
                         raise MochiAPIError(
@@ -200,9 +204,9 @@ def fetch_conversations(
     Returns:
         List of conversation objects
     """
-    config = None
     if session_id:
-        config = MochiConfig(session_id=session_id)
+        with MochiClient(config=MochiConfig(session_id=session_id)) as client:
+            return client.fetch_conversations(org_id, date_from, date_to)
 
-    with MochiClient(config=config) as client:
-        return client.fetch_conversations(org_id, date_from, date_to)
+    # Default configuration: reuse the pooled process-wide client
+    return get_shared_client(MochiClient).fetch_conversations(org_id, date_from, date_to)
@@ -8,6 +8,8 @@ from typing import Any
 import httpx
 from pydantic import BaseModel, Field
 
+from mochi_analytics.integrations.clients import get_shared_client
+
 
 class SlackAPIError(Exception):
     """Raised when Slack API returns an error."""
@@ -315,19 +317,21 @@ def send_daily_digest(
     Returns:
         API response
     """
-    config = None
+    digest = {
+        "channel": channel,
+        "org_name": org_name,
+        "instagram_handle": instagram_handle,
+        "summary": summary,
+        "setters": setters,
+        "date_range": date_range,
+        "stage_labels": stage_labels,
+        "script_results": script_results,
+        "grouped_results": grouped_results
+    }
+
     if bot_token:
-        config = SlackConfig(bot_token=bot_token)
-
-    with SlackClient(config=config) as client:
-        return client.send_daily_digest(
-            channel=channel,
-            org_name=org_name,
-            instagram_handle=instagram_handle,
-            summary=summary,
-            setters=setters,
-            date_range=date_range,
-            stage_labels=stage_labels,
-            script_results=script_results,
-            grouped_results=grouped_results
-        )
+        with SlackClient(config=SlackConfig(bot_token=bot_token)) as client:
+            return client.send_daily_digest(**digest)
+
+    # Default configuration: reuse the pooled process-wide client
+    return get_shared_client(SlackClient).send_daily_digest(**digest)
@@ -2,20 +2,39 @@
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import Any, Generator
 import os
 
+import orjson
+
 # Get database URL from environment
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./mochi_analytics.db")
 
+# Connection pool sizing (ignored for SQLite, which manages its own pool)
+POOL_OPTIONS = {} if DATABASE_URL.startswith("sqlite") else {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "20")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "40")),
+}
+
+
+def _json_serializer(obj: Any) -> str:
+    """Serialize JSON/JSONB column values (job results, reports) with orjson."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
 # SQLite for local development, PostgreSQL for production
 engine = create_engine(
     DATABASE_URL,
     echo=False,  # Set to True for SQL query logging
-    pool_pre_ping=True  # Verify connections before using
+    pool_pre_ping=True,  # Verify connections before using
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    **POOL_OPTIONS
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Sessions are short-lived (one request or worker step), so objects stay readable
+# after commit without a reload SELECT on the next attribute access
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -1,23 +1,34 @@
 """SQLAlchemy database models."""
 
-from sqlalchemy import Column, String, Text, Integer, Float, DateTime, Date, ForeignKey
+from sqlalchemy import Column, String, Text, Integer, Float, DateTime, Date, ForeignKey, Index, LargeBinary, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
-from datetime import datetime
+from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
 
 Base = declarative_base()
 
 
+def utcnow() -> datetime:
+    """Timezone-aware current UTC time, used as the column default."""
+    return datetime.now(timezone.utc)
+
+
 class Job(Base):
     """Analysis job tracking and results storage."""
     __tablename__ = 'jobs'
+    __table_args__ = (
+        Index('ix_jobs_created_id', 'created_at', 'id'),
+        Index('ix_jobs_kind_created', 'kind', 'created_at'),
+    )
 
     id = Column(String(36), primary_key=True)
     status = Column(String(20), nullable=False)  # queued, processing, completed, failed
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
-    started_at = Column(DateTime)
-    completed_at = Column(DateTime)
+    kind = Column(String(30))  # Set for scheduled task runs, e.g. daily_updates
+    created_at = Column(DateTime(timezone=True), nullable=False, default=utcnow)
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=utcnow, onupdate=utcnow)
+    started_at = Column(DateTime(timezone=True))
+    completed_at = Column(DateTime(timezone=True))
 
     # Input config
     org_id = Column(String(255))
@@ -34,30 +45,44 @@ class Job(Base):
     conversation_count = Column(Integer)
     processing_time_seconds = Column(Float)
 
+    # Charts are loaded on access only; PNG payloads are too large to eager-load
+    charts = relationship("Chart", back_populates="job", passive_deletes=True)
+
 
 class Chart(Base):
-    """Chart images stored as base64."""
+    """Chart images stored as raw PNG bytes."""
     __tablename__ = 'charts'
+    __table_args__ = (
+        Index('ix_chart_job_chart', 'job_id', 'chart_id', unique=True),
+    )
 
     id = Column(String(36), primary_key=True)
     job_id = Column(String(36), ForeignKey('jobs.id', ondelete='CASCADE'), nullable=False)
     chart_id = Column(String(50), nullable=False)  # e.g., "new_leads", "funnel_overview"
     filename = Column(String(100), nullable=False)  # e.g., "01_new_leads.png"
-    image_data = Column(Text, nullable=False)  # base64-encoded PNG
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    png = Column(LargeBinary, nullable=False)  # PNG image bytes
+    created_at = Column(DateTime(timezone=True), nullable=False, default=utcnow)
+
+    job = relationship("Job", back_populates="charts")
 
 
 class Report(Base):
     """Framer CMS report queue."""
     __tablename__ = 'reports'
+    __table_args__ = (
+        Index('ix_reports_created_slug', 'created_at', 'slug'),
+        # Small partial index so counting the pending queue stays an index-only scan
+        Index('ix_reports_unpushed', 'created_at', postgresql_where=text('pushed_at IS NULL')),
+    )
 
     slug = Column(String(36), primary_key=True)  # Unique identifier for Framer
     job_id = Column(String(36), ForeignKey('jobs.id', ondelete='SET NULL'))
     data = Column(JSONB, nullable=False)  # Report data
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    expires_at = Column(DateTime)  # Optional TTL
+    created_at = Column(DateTime(timezone=True), nullable=False, default=utcnow)
+    pushed_at = Column(DateTime(timezone=True))  # Set once pushed to Framer CMS
+    expires_at = Column(DateTime(timezone=True))  # Optional TTL
     accessed_count = Column(Integer, default=0)
-    last_accessed_at = Column(DateTime)
+    last_accessed_at = Column(DateTime(timezone=True))
 
 
 class AvatarCluster(Base):
@@ -80,5 +105,5 @@ class AvatarCluster(Base):
     # Samples (stored as JSON array)
     sample_conversations = Column(JSONB)
 
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=utcnow)
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=utcnow, onupdate=utcnow)
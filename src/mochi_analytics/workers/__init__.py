@@ -3,7 +3,11 @@ Background workers and job queue.
 """
 
 from mochi_analytics.workers.queue import JobQueue, get_job_queue, submit_job
-from mochi_analytics.workers.tasks import run_analysis_task, run_daily_updates_task
+from mochi_analytics.workers.tasks import (
+    run_analysis_task,
+    run_daily_updates_task,
+    run_organization_analysis_task,
+)
 
 __all__ = [
     "JobQueue",
@@ -11,4 +15,5 @@ __all__ = [
     "submit_job",
     "run_analysis_task",
     "run_daily_updates_task",
+    "run_organization_analysis_task",
 ]
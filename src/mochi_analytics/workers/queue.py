@@ -6,7 +6,7 @@ For production, replace with Redis Queue (RQ) or Celery.
 import threading
 import queue
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Callable, Any, Dict
 import logging
 
@@ -80,7 +80,7 @@ class JobQueue:
             "func": func,
             "args": args,
             "kwargs": kwargs,
-            "submitted_at": datetime.utcnow()
+            "submitted_at": datetime.now(timezone.utc)
         }
 
         self.queue.put(job)
@@ -110,7 +110,7 @@ class JobQueue:
                 # Update job status to processing
                 session = get_session()
                 try:
-                    job_model = session.query(JobModel).filter(JobModel.id == job_id).first()
+                    job_model = session.get(JobModel, job_id)
                     if job_model:
                         job_model.status = "processing"
                         session.commit()
@@ -124,10 +124,10 @@ class JobQueue:
                     # Update job with result
                     session = get_session()
                     try:
-                        job_model = session.query(JobModel).filter(JobModel.id == job_id).first()
+                        job_model = session.get(JobModel, job_id)
                         if job_model:
                             job_model.status = "completed"
-                            job_model.completed_at = datetime.utcnow()
+                            job_model.completed_at = datetime.now(timezone.utc)
                             if result is not None:
                                 job_model.result = result
                             session.commit()
@@ -141,10 +141,10 @@ class JobQueue:
                     # Update job with error
                     session = get_session()
                     try:
-                        job_model = session.query(JobModel).filter(JobModel.id == job_id).first()
+                        job_model = session.get(JobModel, job_id)
                         if job_model:
                             job_model.status = "failed"
-                            job_model.completed_at = datetime.utcnow()
+                            job_model.completed_at = datetime.now(timezone.utc)
                             job_model.error = str(e)
                             session.commit()
                     finally:
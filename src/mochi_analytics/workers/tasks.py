@@ -3,13 +3,24 @@ Background task definitions.
 """
 
 import logging
-from datetime import datetime, timedelta
-import pytz
+import uuid
+from datetime import datetime, timedelta, timezone
 
-from mochi_analytics.core.models import Conversation, AnalysisConfig
+from mochi_analytics.core.models import CONVERSATION_LIST_ADAPTER, AnalysisConfig
 from mochi_analytics.core.analyzer import analyze_conversations, analyze_conversations_simplified
-from mochi_analytics.core.script_search import run_script_searches
-from mochi_analytics.integrations import fetch_conversations, get_slack_configs, send_daily_digest
+from mochi_analytics.core.script_search import (
+    build_script_search_corpus,
+    run_grouped_script_searches,
+    run_script_searches,
+)
+from mochi_analytics.core.timestamps import get_timezone
+from mochi_analytics.integrations import (
+    MochiAPIError,
+    fetch_conversations,
+    get_organizations_by_ids,
+    get_slack_configs,
+    send_daily_digest,
+)
 from mochi_analytics.exporters.charts import generate_all_charts
 from mochi_analytics.storage.database import get_session
 from mochi_analytics.storage.models import Chart
@@ -34,7 +45,7 @@ def run_analysis_task(
     logger.info(f"Starting analysis task for {len(conversations_data)} conversations")
 
     # Parse conversations
-    conversations = [Conversation.model_validate(c) for c in conversations_data]
+    conversations = CONVERSATION_LIST_ADAPTER.validate_python(conversations_data)
 
     # Parse config
     config = AnalysisConfig.model_validate(config_dict)
@@ -59,12 +70,14 @@ def run_analysis_task(
             session = get_session()
             try:
                 job_id = config_dict.get("job_id")  # If passed in
-                for chart_id, png_base64 in charts.items():
+                for chart_id, png in charts.items():
                     chart = Chart(
+                        id=str(uuid.uuid4()),
                         job_id=job_id,
                         chart_id=chart_id,
-                        png_base64=png_base64,
-                        created_at=datetime.utcnow()
+                        filename=f"{chart_id}.png",
+                        png=png,
+                        created_at=datetime.now(timezone.utc)
                     )
                     session.add(chart)
                 session.commit()
@@ -78,6 +91,38 @@ def run_analysis_task(
     return result.model_dump()
 
 
+def run_organization_analysis_task(
+    org_id: str,
+    date_from: str,
+    date_to: str,
+    config_dict: dict
+) -> dict:
+    """
+    Fetch an organization's conversations from Mochi and run full analysis.
+
+    Args:
+        org_id: Organization UUID
+        date_from: Start date (YYYY-MM-DD)
+        date_to: End date (YYYY-MM-DD)
+        config_dict: Analysis configuration dictionary
+
+    Returns:
+        Analysis result as dictionary
+    """
+    logger.info(f"Fetching conversations for {org_id} ({date_from} to {date_to})")
+
+    try:
+        conversations_data = fetch_conversations(
+            org_id=org_id,
+            date_from=date_from,
+            date_to=date_to
+        )
+    except MochiAPIError as e:
+        raise MochiAPIError(f"Mochi API error: {e}") from e
+
+    return run_analysis_task(conversations_data, config_dict)
+
+
 def run_daily_updates_task(dry_run: bool = False, org_filter: str | None = None, force_send: bool = False) -> dict:
     """
     Run daily Slack updates for all configured organizations.
@@ -107,12 +152,18 @@ def run_daily_updates_task(dry_run: bool = False, org_filter: str | None = None,
     errors = []
     skipped = 0
 
+    # Look up all linked organizations in one batch instead of once per config
+    try:
+        orgs_by_id = get_organizations_by_ids(c.organization_id for c in slack_configs)
+    except Exception as e:
+        logger.error(f"Failed to get organizations: {e}")
+        return {"error": str(e), "updates_sent": 0}
+
     # Filter by organization name if specified
     if org_filter:
-        from mochi_analytics.integrations import get_organization_by_id
         filtered_configs = []
         for config in slack_configs:
-            org = get_organization_by_id(config.organization_id)
+            org = orgs_by_id.get(config.organization_id)
             if org and org_filter.lower() in org.organization_name.lower():
                 filtered_configs.append(config)
         slack_configs = filtered_configs
@@ -128,8 +179,7 @@ def run_daily_updates_task(dry_run: bool = False, org_filter: str | None = None,
                 continue
 
             # Get org timezone and check if current hour matches schedule_time
-            from mochi_analytics.integrations import get_organization_by_id
-            org = get_organization_by_id(config.organization_id)
+            org = orgs_by_id.get(config.organization_id)
 
             if org:
                 try:
@@ -137,7 +187,7 @@ def run_daily_updates_task(dry_run: bool = False, org_filter: str | None = None,
                     schedule_hour, schedule_minute = map(int, config.schedule_time.split(':'))
 
                     # Get current time in org's timezone
-                    org_tz = pytz.timezone(org.timezone)
+                    org_tz = get_timezone(org.timezone)
                     current_time = datetime.now(org_tz)
 
                     # Check if current hour matches (allow ±5 minute window)
@@ -160,14 +210,13 @@ def run_daily_updates_task(dry_run: bool = False, org_filter: str | None = None,
             org_id = config.organization_id
 
             # Get org timezone
-            from mochi_analytics.integrations import get_organization_by_id
-            org = get_organization_by_id(org_id)
+            org = orgs_by_id.get(org_id)
             if not org:
                 logger.warning(f"Organization {org_id} not found in Airtable")
                 continue
 
             # Calculate yesterday in org's timezone
-            org_tz = pytz.timezone(org.timezone)
+            org_tz = get_timezone(org.timezone)
             org_now = datetime.now(org_tz)
             yesterday_org_tz = (org_now - timedelta(days=1)).date()
 
@@ -192,7 +241,7 @@ def run_daily_updates_task(dry_run: bool = False, org_filter: str | None = None,
                 continue
 
             # Parse conversations
-            conversations = [Conversation.model_validate(c) for c in conversations_data]
+            conversations = CONVERSATION_LIST_ADAPTER.validate_python(conversations_data)
 
             # Run simplified analysis (no LLM features)
             # Use org's timezone and only analyze yesterday in that timezone
@@ -203,6 +252,16 @@ def run_daily_updates_task(dry_run: bool = False, org_filter: str | None = None,
                 end_date=yesterday_org_tz
             )
 
+            # Creator messages from yesterday, scanned once for script and grouped searches
+            corpus = None
+            if config.script_configs or config.grouped_configs:
+                corpus = build_script_search_corpus(
+                    conversations,
+                    timezone=org.timezone,
+                    date_from=yesterday_org_tz,
+                    date_to=yesterday_org_tz
+                )
+
             # Run script analysis if configured
             script_results = None
             if config.script_configs:
@@ -211,52 +270,21 @@ def run_daily_updates_task(dry_run: bool = False, org_filter: str | None = None,
                     conversations=conversations,
                     script_configs=config.script_configs,
                     timezone=org.timezone,
-                    target_date=yesterday_org_tz
+                    target_date=yesterday_org_tz,
+                    corpus=corpus
                 )
 
             # Run grouped analysis if configured
             grouped_results = None
             if config.grouped_configs:
-                from mochi_analytics.core.script_search import ScriptSearchResult
-                grouped_results = []
-                for group in config.grouped_configs:
-                    logger.info(f"Running grouped analysis '{group.label}' with {len(group.member_configs)} members for {org.organization_name}")
-                    # Run script searches for each member
-                    member_results = run_script_searches(
-                        conversations=conversations,
-                        script_configs=group.member_configs,
-                        timezone=org.timezone,
-                        target_date=yesterday_org_tz
-                    )
-                    # Sum the results
-                    total_matches = sum(r.total_matches for r in member_results)
-                    total_replies = sum(r.total_replies for r in member_results)
-                    reply_rate = (total_replies / total_matches * 100) if total_matches > 0 else 0.0
-
-                    # Merge setters_breakdown
-                    merged_setters: dict[str, dict[str, int | float]] = {}
-                    for r in member_results:
-                        for setter, data in r.setters_breakdown.items():
-                            if setter not in merged_setters:
-                                merged_setters[setter] = {"matches": 0, "replies": 0, "reply_rate": 0.0}
-                            merged_setters[setter]["matches"] += data.get("matches", 0)
-                            merged_setters[setter]["replies"] += data.get("replies", 0)
-
-                    # Calculate reply_rate for each setter
-                    for setter, data in merged_setters.items():
-                        matches = data["matches"]
-                        replies = data["replies"]
-                        data["reply_rate"] = (replies / matches * 100) if matches > 0 else 0.0
-
-                    grouped_results.append(ScriptSearchResult(
-                        query="[grouped]",
-                        label=group.label,
-                        total_matches=total_matches,
-                        total_replies=total_replies,
-                        reply_rate=round(reply_rate, 1),
-                        setters_breakdown=merged_setters
-                    ))
-                    logger.info(f"Grouped '{group.label}': {total_matches} total matches")
+                logger.info(f"Running {len(config.grouped_configs)} grouped analyses for {org.organization_name}")
+                grouped_results = run_grouped_script_searches(
+                    conversations=conversations,
+                    grouped_configs=config.grouped_configs,
+                    timezone=org.timezone,
+                    target_date=yesterday_org_tz,
+                    corpus=corpus
+                )
 
             # Send Slack digest
             if not dry_run: